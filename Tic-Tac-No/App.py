@@ -9,13 +9,20 @@ Got inspiration from https://www.geeksforgeeks.org/tic-tac-toe-gui-in-python-usi
 
 import pygame as pg
 import game
-from time import sleep
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+
+FPS = 60  # Frames per second of the main loop
+AI_DELAY = 1500  # Minimum amount of milliseconds before the AI's move is shown
+END_DELAY = 2000  # Milliseconds the final position is shown
+DOT_TIME = 400  # Milliseconds per dot of the animation while the AI thinks
+AI_DONE = pg.USEREVENT  # Event posted when the AI's search has finished
 
 """
 Class with the game logic .
 """
 class App:
-    def __init__(self, size):
+    def __init__(self, size, board_size=game.BOARD_SIZE, n=game.GAME_N):
         """
         Constructor for the App class.
 
@@ -23,17 +30,26 @@ class App:
         ----------
         size : int/float
             size of the display.
+        board_size : int, optional
+            Amount of squares on one side of the board. The default is BOARD_SIZE.
+        n : int, optional
+            Amount of squares in a line needed to win. The default is GAME_N.
 
         """
         self.games_played, self.ai_won, self.draw, self.human_won = 0, 0, 0, 0
         self.human = game.HumanPlayer('X')
-        self.ai = game.MiniMaxPlayer('O')
+        self.ai = game.MiniMaxPlayer('O', time_limit=game.TIME_LIMIT)
         self.ai.set_other_player(self.human)
-        self.screen = Screen(size)
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.screen = Screen(size, board_size, n)
 
     def on_execute(self):
         """
         Handling the game logic.
+        The AI searches in a background thread, while the main loop keeps
+        handling events and animating at a steady frame rate.
+        Between frames it sleeps until an event arrives
+        or the display has to change.
 
         Returns
         -------
@@ -47,54 +63,109 @@ class App:
             return False
 
         self.screen.draw_lines()
-        running = True
-        won = False
-        draw = False
+        clock = pg.time.Clock()
+        search = None  # Future of the AI's search
+        started = None  # Time at which the AI started thinking
+        ended = None  # Time at which the game was over
+        shown = None  # Message at the bottom of the display
+
+        # Main game loop, ends when the player exits
+        # or when the final position has been shown long enough
+        while ended is None or pg.time.get_ticks() - ended < END_DELAY:
+            # Sleeping until an event arrives or the display has to change
+            now = pg.time.get_ticks()
+            if ended is not None:
+                timeout = END_DELAY - (now - ended)
+            elif human_playing:
+                timeout = None
+            elif search is None:
+                timeout = 0
+            else:
+                timeout = DOT_TIME - (now - started) % DOT_TIME
+                if search.done():
+                    timeout = min(timeout, AI_DELAY - (now - started))
 
-        # Main game loop, ends when the player exits or the game is over
-        while running and not won and not draw:
-            for event in pg.event.get():
+            move = None
+            for event in self.screen.wait(timeout):
                 if event.type == pg.QUIT:
-                    running = False
-
-            # Checks whose turn it is and makes a ask which square they'll play
-            if human_playing:
-                current_player = self.human
-                self.screen.text(current_player=current_player,
-                                 human=self.human, ai=self.ai)
-                move = self.screen.user_click()
-            else:
-                current_player = self.ai
-                self.screen.text(current_player=current_player,
-                                 human=self.human, ai=self.ai)
-                move = self.ai.play(self.screen.board.get_board_copy())
-            if move is None:
-                return False
+                    self.cancel_search(search)
+                    return False
+                elif (event.type == pg.MOUSEBUTTONUP and human_playing
+                        and ended is None):
+                    move = self.screen.get_square(event.pos)
+
+            # Checks whose turn it is and whether the AI is done thinking
+            current_player = self.human if human_playing else self.ai
+            thinking = not human_playing and ended is None
+            if thinking and search is None:
+                started = pg.time.get_ticks()
+                self.ai.cancelled = False
+                search = self.executor.submit(
+                    self.ai.search, self.screen.board.get_board_copy())
+                search.add_done_callback(
+                    lambda _: pg.event.post(pg.event.Event(AI_DONE)))
+            elif (thinking and search.done()
+                    and pg.time.get_ticks() - started >= AI_DELAY):
+                move = search.result()[0]
+                search = None
 
             # Makes a play and updates the display and variables
-            self.play(move, current_player)
-            self.screen.text(current_player=current_player,
-                             human=self.human, ai=self.ai)
-
-            winner = self.screen.is_winner(self.human, self.ai)
-            won = winner > 0
-            draw = winner == 0
-            self.screen.update_visuals(move)
-            human_playing = not human_playing
-
-        # Draw the red line if someone has won            
-        if won:
-            self.screen.draw_winning_line(current_player)
-            if current_player == self.ai:
-                self.ai_won += 1
-            else:
-                self.human_won += 1
-        else:
-            self.draw += 1
+            if move is not None:
+                self.play(move, current_player)
+                self.screen.update_visuals(move)
+                if self.screen.board.get_winner() is not None:
+                    # Draw the red line
+                    self.screen.draw_winning_line(current_player)
+                    if current_player == self.ai:
+                        self.ai_won += 1
+                    else:
+                        self.human_won += 1
+                    ended = pg.time.get_ticks()
+                elif self.screen.board.is_full():
+                    self.draw += 1
+                    ended = pg.time.get_ticks()
+                else:
+                    human_playing = not human_playing
+                    current_player = self.human if human_playing else self.ai
+                thinking = not human_playing and ended is None
+
+            message = self.screen.get_message(current_player=current_player,
+                                              human=self.human, ai=self.ai)
+            if thinking:
+                dots = 0
+                if search is not None:
+                    dots = (pg.time.get_ticks() - started) // DOT_TIME % 4
+                message = f'The {self.ai.get_name()} is thinking' + '.' * dots
+            if message != shown:
+                self.screen.text(msg=message)
+                shown = message
+            clock.tick(FPS)
+
         self.games_played += 1
-        sleep(2) # Dramatic effect
         return True
 
+    def cancel_search(self, search):
+        """
+        Stops a running search of the AI and waits for its thread.
+
+        Parameters
+        ----------
+        search : Future
+            The search, None if the AI is not thinking.
+
+        """
+        if search is not None:
+            self.ai.cancel()
+            wait([search])
+
+    def close(self):
+        """
+        Shuts down the thread of the AI.
+
+        """
+        self.executor.shutdown()
+        self.ai.close()
+
     def play(self, move, player):
         """
         Calls the play function of the player's class in the game module.
@@ -159,11 +230,129 @@ class App:
         print(string)
 
 
+"""
+Positions of the lines and squares on the display, for one board size.
+"""
+class Layout:
+    def __init__(self, width, board_size):
+        """
+        Constructor for the Layout class.
+
+        Parameters
+        ----------
+        width : int/float
+            Width (and height) of the board on the display.
+        board_size : int
+            Amount of squares on one side of the board.
+
+        """
+        self.cell = width / board_size
+        self.image_size = round(self.cell * 0.95)
+        self.line_width = max(2, round(self.cell / 38))
+        self.win_width = max(4, round(self.cell / 18))
+        self.lines = []
+        for i in range(board_size + 1):
+            self.lines.append(((self.cell * i, 0), (self.cell * i, width)))
+            self.lines.append(((0, self.cell * i), (width, self.cell * i)))
+
+        # Top left corner of the image in every square
+        margin = (self.cell - self.image_size) / 2
+        self.origins = {(row, col): (self.cell * col + margin,
+                                     self.cell * row + margin)
+                        for row in range(board_size)
+                        for col in range(board_size)}
+
+    def get_centre(self, square):
+        """
+        Returns the (x, y) position of the centre of a square.
+
+        """
+        row, col = square
+        return self.cell * (col + 0.5), self.cell * (row + 0.5)
+
+    def get_square(self, x, y):
+        """
+        Returns the (row, col) square at a position on the board.
+
+        """
+        return int(y // self.cell), int(x // self.cell)
+
+
+@lru_cache(maxsize=None)
+def get_layout(width, board_size):
+    """
+    Returns the (cached) layout of a board size on a display.
+
+    Parameters
+    ----------
+    width : int/float
+        Width (and height) of the board on the display.
+    board_size : int
+        Amount of squares on one side of the board.
+
+    Returns
+    -------
+    Layout
+        Positions of the lines and squares.
+
+    """
+    return Layout(width, board_size)
+
+
+@lru_cache(maxsize=None)
+def get_sprite(name, size):
+    """
+    Loads an image and scales it, once per image and size.
+    The display mode has to be set before, for the pixel format.
+
+    Parameters
+    ----------
+    name : str
+        File name of the image in the images folder.
+    size : int
+        Width and height of the scaled image.
+
+    Returns
+    -------
+    Surface
+        The scaled image.
+
+    """
+    image = pg.image.load(f'./images/{name}')
+    return pg.transform.smoothscale(image, (size, size)).convert_alpha()
+
+
+@lru_cache(maxsize=None)
+def get_grid(width, board_size):
+    """
+    Renders the empty board, once per display and board size.
+
+    Parameters
+    ----------
+    width : int/float
+        Width (and height) of the board on the display.
+    board_size : int
+        Amount of squares on one side of the board.
+
+    Returns
+    -------
+    grid : Surface
+        The board with the lines between the squares.
+
+    """
+    layout = get_layout(width, board_size)
+    grid = pg.Surface((width, width)).convert()
+    grid.fill((255, 255, 255))
+    for start, end in layout.lines:
+        pg.draw.line(grid, 0, start, end, layout.line_width)
+    return grid
+
+
 """
 Class handling all the display actions.
 """
 class Screen:
-    def __init__(self, size):
+    def __init__(self, size, board_size=game.BOARD_SIZE, n=game.GAME_N):
         """
         Constructor for the Screen class.
 
@@ -171,56 +360,68 @@ class Screen:
         ----------
         size : int/float
             size of the display.
+        board_size : int, optional
+            Amount of squares on one side of the board. The default is BOARD_SIZE.
+        n : int, optional
+            Amount of squares in a line needed to win. The default is GAME_N.
 
         """
-        self.board = game.Board()
+        self.board = game.BitBoard(size=board_size, n=n)
         self.width, self.height = size, size
+        self.layout = get_layout(size, board_size)
         self.screen = pg.display.set_mode((self.width,
                                            self.height + self.height / 5))
-        self.circle, self.cross, self.yes_no = self.load_images()
+        self.circle = get_sprite('circle.png', self.layout.image_size)
+        self.cross = get_sprite('cross.png', self.layout.image_size)
+        self.yes_no = get_sprite('yes_no.png', round(self.width))
+        self.grid = get_grid(size, board_size)
         pg.display.set_caption('Tic-Tac-No')
         pg.init()
+        self.font = pg.font.Font(None, self.width // 10)
+        self.texts = {}  # Rendered messages
+        self.dirty = []  # Parts of the display which have changed
 
-    def load_images(self):
+    def draw_lines(self):
         """
-        Loads the images used in the app.
+        Draws the lines, such that the sqaures become visible.
 
-        Returns
-        -------
-        circle : Surface
-            Image of a circle.
-        cross : Surface
-            Image of a cross.
-        yes_no : Surface
-            Image of yes and no.
-
-        """
-        # Loading the images
-        o_img = pg.image.load('./images/circle.png')
-        x_img = pg.image.load('./images/cross.png')
-        yes_no_img = pg.image.load('./images/yes_no.png')
-
-        # Resizing the images
-        size = self.width / 3 - self.width / 60
-        circle = pg.transform.scale(o_img, (size, size))
-        cross = pg.transform.scale(x_img, (size, size))
-        yes_no = pg.transform.scale(yes_no_img, (self.width, self.width))
-        return circle, cross, yes_no
+        """
+        self.dirty.append(self.screen.blit(self.grid, (0, 0)))
 
-    def draw_lines(self):
+    def update(self):
         """
-        Draws the lines, such that the sqaures become visible.
+        Updates the parts of the display which have changed.
+
+        """
+        if self.dirty:
+            pg.display.update(self.dirty)
+            self.dirty = []
 
+    def wait(self, timeout=None):
         """
-        self.screen.fill((255, 255, 255))
+        Updates the display and sleeps until an event arrives.
+
+        Parameters
+        ----------
+        timeout : int, optional
+            Maximum amount of milliseconds to sleep.
+            The default is None, which sleeps until the next event.
+
+        Returns
+        -------
+        events : list
+            The events which have arrived, empty if the time ran out.
 
-        # Drawing the inner and outer lines 
-        for i in range(4):
-            pg.draw.line(self.screen, 0, (self.width / 3 * i, 0),
-                         (self.width / 3 * i, self.height), 7)
-            pg.draw.line(self.screen, 0, (0, self.height / 3 * i),
-                         (self.width, self.height / 3 * i), 7)
-        pg.display.update()
+        """
+        self.update()
+        if timeout is None:
+            events = [pg.event.wait()]
+        elif timeout > 0:
+            events = [pg.event.wait(int(timeout))]
+        else:
+            events = []
+        return [event for event in events + pg.event.get()
+                if event.type != pg.NOEVENT]
 
     def text(self, current_player=None, human=None, ai=None, msg=None):
         """
@@ -240,62 +441,77 @@ class Screen:
 
         """
         if msg is None:
-            situation = self.is_winner(human, ai)
-            if situation == -1:
-                message = f'The {current_player.get_name()}\'s turn'
-            elif situation == 0:
-                message = 'It\'s a draw'
-            elif situation == 1:
-                message = f'The {human.get_name()} has won'
-            elif situation == 2:
-                message = f'The {ai.get_name()} has won'
+            message = self.get_message(current_player, human, ai)
         else:
             message = msg
 
-        pg.font.init()
-        font = pg.font.Font(None, self.width // 10)
-        text = font.render(message, True, (255, 255, 255))
-        self.screen.fill(0, (0, self.height, self.width, self.height / 5))
+        if message not in self.texts:
+            self.texts[message] = self.font.render(message, True,
+                                                   (255, 255, 255)).convert_alpha()
+        text = self.texts[message]
+        self.dirty.append(self.screen.fill(
+            0, (0, self.height, self.width, self.height / 5)))
         text_rect = text.get_rect(center=(self.width / 2,
                                           self.height + self.height / 10))
         self.screen.blit(text, text_rect)
-        pg.font.quit()
-        pg.display.update()
 
-    def user_click(self):
+    def get_message(self, current_player, human, ai):
+        """
+        Describes whose turn it is or who has won.
+
+        Parameters
+        ----------
+        current_player : game.PlayerInterface
+            Player whose turn it is.
+        human : game,HumanPlayer
+            The human player.
+        ai : game.MiniMaxPlayer
+            The AI player.
+
+        Returns
+        -------
+        message : str
+            The description.
+
+        """
+        situation = self.is_winner(human, ai)
+        if situation == -1:
+            message = f'The {current_player.get_name()}\'s turn'
+        elif situation == 0:
+            message = 'It\'s a draw'
+        elif situation == 1:
+            message = f'The {human.get_name()} has won'
+        elif situation == 2:
+            message = f'The {ai.get_name()} has won'
+        return message
+
+    def get_square(self, position):
         """
         Handling the user's input, which is in the form of clicks.
 
+        Parameters
+        ----------
+        position : (int, int)
+            Position of the click on the display.
+
         Returns
         -------
         None
-            If the user decides to exit the app.
+            If the click was not on an open square.
         row, col : int, int
             Tuple representing the column the player has chosen to play.
 
         """
-        running = True
-
-        # Getting the user input
-        while running:
-            for event in pg.event.get():
-                if event.type == pg.QUIT:
-                    return None
-                elif event.type == pg.MOUSEBUTTONUP:
-                    x, y = pg.mouse.get_pos()
-                    running = False
-
         # Checking which square they clicked on
-        col = int(x // (self.width / 3))
+        x, y = position
         if y > self.height:
-            return self.user_click()
-        else:
-            row = int(y // (self.height / 3))
+            return None
+        row, col = self.layout.get_square(x, y)
 
         # Checking whether it has already been selected or not
-        if isinstance(self.board.get_board()[row, col], game.PlayerInterface):
+        if not self.board.move_is_valid((row, col)):
             self.text(msg='Already taken, pick another')
-            return self.user_click()
+            return None
 
         return row, col
 
@@ -309,86 +525,39 @@ class Screen:
             The square of the board which has been played.
 
         """
-        row, col = move
-
-        if isinstance(self.board.get_board()[row, col], game.HumanPlayer):
-            self.screen.blit(self.cross, (self.width / 3 * col,
-                                          self.height / 3 * row))
-        elif isinstance(self.board.get_board()[row, col], game.MiniMaxPlayer):
-            self.screen.blit(self.circle, (self.width / 3 * col,
-                                           self.height / 3 * row))
-        pg.display.update()
+        player = self.board.get_player(move)
+        if isinstance(player, game.HumanPlayer):
+            self.dirty.append(self.screen.blit(self.cross,
+                                               self.layout.origins[move]))
+        elif isinstance(player, game.MiniMaxPlayer):
+            self.dirty.append(self.screen.blit(self.circle,
+                                               self.layout.origins[move]))
 
     def draw_winning_line(self, current_player):
         """
-        Draw a red line trough the three 'winning' squares on the board.
-
-        Parameters
-        ----------
-        current_player : game.PlayerInterface
-            The player who has won.
-
-        """
-        # Get the type of line to draw
-        line, n = self.get_position(current_player)
-
-        # Draw the line, depending on the type
-        if line == 'row':
-            pg.draw.line(self.screen, (255, 0, 0),
-                         (self.width / 12, self.height / 6 + n * self.height / 3),
-                         (self.width * 11 / 12, self.height / 6 + n * self.height / 3), 15)
-        elif line == 'col':
-            pg.draw.line(self.screen, (255, 0, 0),
-                         (self.width / 6 + n * self.width / 3, self.height / 12),
-                         (self.width / 6 + n * self.width / 3, self.height * 11 / 12), 15)
-        elif line == 'dia' and n == 0:
-            pg.draw.line(self.screen, (255, 0, 0),
-                         (self.width / 12, self.height / 12),
-                         (self.height * 11 / 12, self.height * 11 / 12), 15)
-        elif line == 'dia' and n == 1:
-            pg.draw.line(self.screen, (255, 0, 0),
-                         (self.width * 11 / 12, self.height / 12),
-                         (self.height / 12, self.height * 11 / 12), 15)
-        pg.display.update()
-
-    def get_position(self, current_player):
-        """
-        Looking which in which direction the winning line has to be drawn,
-        and where it has to start.
+        Draw a red line trough the 'winning' squares on the board.
 
         Parameters
         ----------
         current_player : game.PlayerInterface
             The player who has won.
 
-        Returns
-        -------
-        str
-            Description of the direction.
-        int
-            number of the staring column/row
-            or in case the str is 'dia':
-                0 -> top left to bottom right
-                1 -> top right to bottom left.
-
         """
-        b = self.board.get_board()
-
-        # Check for a winner row
-        for i, row in enumerate(b):
-            if self.board.has_winner(row, current_player):
-                return 'row', i
-
-        # Check for a winner column
-        for i, col in enumerate(b.transpose()):
-            if self.board.has_winner(col, current_player):
-                return 'col', i
-
-        # Check for a diagonal winner
-        if self.board.has_winner([b[0, 0], b[1, 1], b[2, 2]], current_player):
-            return 'dia', 0
-        if self.board.has_winner([b[0, 2], b[1, 1], b[2, 0]], current_player):
-            return 'dia', 1
+        squares = self.board.get_winning_line(current_player)
+        if squares is None:
+            return
+
+        # From the first to the last square, a quarter square further
+        (x1, y1), (x2, y2) = (self.layout.get_centre(squares[0]),
+                              self.layout.get_centre(squares[-1]))
+        dx = (x2 > x1) - (x2 < x1)
+        dy = (y2 > y1) - (y2 < y1)
+        extra = self.layout.cell / 4
+        rect = pg.draw.line(self.screen, (255, 0, 0),
+                            (x1 - dx * extra, y1 - dy * extra),
+                            (x2 + dx * extra, y2 + dy * extra),
+                            self.layout.win_width)
+        self.dirty.append(rect)
 
     def yes_or_no(self, message):
         """
@@ -405,22 +574,17 @@ class Screen:
             True if yes is chosen, False if no is chosen.
 
         """
-        self.screen.blit(self.yes_no, (0, 0))
+        self.dirty.append(self.screen.blit(self.yes_no, (0, 0)))
         self.text(msg=message)
-        running = True
 
-        # Checking user inputs
-        while running:
-            for event in pg.event.get():
+        # Sleeping until the user clicks or exits
+        while True:
+            for event in self.wait():
                 if event.type == pg.QUIT:
                     return None
                 elif event.type == pg.MOUSEBUTTONUP:
-                    x, y = pg.mouse.get_pos()
-
                     # If the player clicked in the top half of the display
-                    result = y < self.height / 2
-                    running = False
-        return result
+                    return event.pos[1] < self.height / 2
 
     def is_winner(self, human, ai):
         """
@@ -444,9 +608,10 @@ class Screen:
             -1 if the game has not yet finished.
 
         """
-        if self.board.is_winner(human):
+        winner = self.board.get_winner()
+        if winner == human:
             return 1
-        elif self.board.is_winner(ai):
+        elif winner == ai:
             return 2
         elif self.board.is_full():
             return 0
@@ -463,5 +628,6 @@ if __name__ == '__main__':
             break
         app.reset_board()
 
+    app.close()
     app.print_results()
     pg.quit()
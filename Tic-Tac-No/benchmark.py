@@ -0,0 +1,429 @@
+"""
+Benchmarks of the hot paths of Board and MiniMaxPlayer on a grid of
+board geometries and a fixed set of reference positions.
+The results are printed and written to a JSON file; when a previous
+results file is given, every benchmark is compared with it.
+Every timing is measured in several rounds in new processes and the best
+round is kept. A benchmark only counts as a regression when it has become
+worse by more than the noise of the rounds, also after measuring it again.
+
+Usage: python benchmark.py [-o results.json] [-c previous.json]
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import timeit
+import tracemalloc
+import game
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from statistics import median
+
+# Board size, GAME_N and max depth of the search benchmarks
+GRID = [(3, 3, None), (4, 3, None), (4, 4, 6), (5, 4, 5), (6, 4, 4), (7, 4, 3)]
+# Fraction of the squares played in every reference position,
+# rounded to an odd amount of moves such that the AI is to move
+POSITIONS = {'first_move': 0, 'opening': 0.2, 'middle': 0.5}
+# Slowdown from which a benchmark counts as a regression, above the noise
+# of timings between runs on a shared machine
+REGRESSION = 1.25
+ROUNDS = 8  # Amount of times every timing is measured, the best one is kept
+
+
+def reference_position(size, n, fraction):
+    """
+    Creates a reference position: a fixed, seeded sequence of moves
+    in which neither player has won yet.
+
+    Parameters
+    ----------
+    size : int
+        Size of one side of the board.
+    n : int
+        Amount of squares in a line needed to win.
+    fraction : float
+        Fraction of the squares to play.
+
+    Returns
+    -------
+    board : game.BitBoard
+        The position, with the AI ('O') to move.
+    human : game.HumanPlayer
+        The player who started.
+    ai : game.MiniMaxPlayer
+        The player to move.
+
+    """
+    human = game.HumanPlayer('X')
+    ai = game.MiniMaxPlayer('O', use_tablebase=False, table_size=2 ** 18)
+    ai.set_other_player(human)
+
+    rng = random.Random(f'{size}{n}')
+    board = game.BitBoard(size=size, n=n)
+    squares = board.get_open_squares()
+    rng.shuffle(squares)
+    moves = int(fraction * size * size) // 2 * 2 + 1
+    for square in squares:
+        if len(board.history) == moves:
+            break
+        player = human if len(board.history) % 2 == 0 else ai
+        board.make_move(square, player)
+        if board.get_winner() is not None:
+            board.undo_move()
+    return board, human, ai
+
+
+def ops_per_second(function, seconds=0.01, repeat=2):
+    """"Returns how many times per second function can be called."""
+    timer = timeit.Timer(function)
+    number = 1
+    while timer.timeit(number) < seconds:
+        number *= 2
+    return number / min(timer.repeat(repeat, number))
+
+
+def higher_is_better(benchmark):
+    """"Returns whether a benchmark improves by going up, like calls per second."""
+    return '.' in benchmark or benchmark == 'nodes_per_second'
+
+
+def is_timing(benchmark):
+    """"Returns whether a benchmark depends on the speed of the machine."""
+    return (higher_is_better(benchmark)
+            or benchmark in ('time_to_first_move', 'time_to_move'))
+
+
+def board_benchmarks(board, human):
+    """
+    Measures the board operations which are called at every search node.
+
+    Returns
+    -------
+    dict
+        Calls per second of every operation.
+
+    """
+    square = board.get_open_squares()[0]
+
+    def make_undo():
+        board.make_move(square, human)
+        board.undo_move()
+
+    return {'is_winner': ops_per_second(lambda: board.is_winner(human)),
+            'is_winning_move': ops_per_second(
+                lambda: board.is_winning_move(square, human)),
+            'is_full': ops_per_second(board.is_full),
+            'get_board_copy': ops_per_second(board.get_board_copy),
+            'make_undo_move': ops_per_second(make_undo),
+            'get_open_squares': ops_per_second(board.get_open_squares)}
+
+
+def search_benchmarks(board, ai, depth):
+    """
+    Measures the first search of a new MiniMaxPlayer from the position,
+    as at its first move of a game, and a second one with the caches
+    which the first search filled.
+
+    Returns
+    -------
+    dict
+        Seconds until the move is known in the first and the second search,
+        positions per second and the amount of positions of the second one.
+
+    """
+    ai.max_depth = depth
+    ai.table.clear()
+    first = ai.search(board)[1]
+    ai.table.clear()
+    # Timing without garbage collection, like timeit
+    gc.disable()
+    try:
+        stats = ai.search(board)[1]
+    finally:
+        gc.enable()
+    return {'time_to_first_move': first.seconds,
+            'time_to_move': stats.seconds,
+            'nodes_per_second': stats.nodes / stats.seconds,
+            'nodes': stats.nodes}
+
+
+def memory_benchmarks(board, ai, depth):
+    """
+    Measures the memory of one search of MiniMaxPlayer from the position.
+
+    Python has no count of the allocations a search makes, only of the
+    memory blocks allocated at a time, so the blocks which the search
+    leaves allocated are counted instead.
+
+    Returns
+    -------
+    dict
+        Peak memory in bytes and memory blocks still allocated afterwards.
+
+    """
+    ai.max_depth = depth
+    ai.table.clear()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    ai.play(board)
+    after = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff
+                 for stat in after.compare_to(before, 'filename'))
+    return {'peak_memory': peak, 'retained_blocks': blocks}
+
+
+def get_cases():
+    """
+    Creates the reference positions of every geometry.
+
+    Returns
+    -------
+    cases : list
+        Tuples of the board size, n, max depth, name of the position,
+        the position as BitBoard and as Board, the human and the AI.
+
+    """
+    cases = []
+    for size, n, depth in GRID:
+        for position, fraction in POSITIONS.items():
+            board, human, ai = reference_position(size, n, fraction)
+            plain_board = game.Board(size=size, n=n)
+            for square, player, _ in board.history:
+                plain_board.make_move(square, player)
+            cases.append((size, n, depth, position, board, plain_board,
+                          human, ai))
+    return cases
+
+
+def measure_round(indices):
+    """
+    Measures every timing once, on the reference positions with the given
+    indices in get_cases.
+
+    Returns
+    -------
+    dict
+        Dict of the measurements of every case, by index.
+
+    """
+    cases = get_cases()
+    measured = {}
+    for index in indices:
+        size, n, depth, position, board, plain_board, human, ai = cases[index]
+        measurements = {}
+        for name, tested in (('Board', plain_board), ('BitBoard', board)):
+            for benchmark, value in board_benchmarks(tested, human).items():
+                measurements[f'{name}.{benchmark}'] = value
+        measurements.update(search_benchmarks(board, ai, depth))
+        measured[index] = measurements
+    return measured
+
+
+def measure_rounds(indices, rounds, timings):
+    """
+    Measures the timings of the reference positions with the given indices
+    in rounds, each in a new process, such that neither a slow spell of the
+    machine nor the memory layout of one process decides the result.
+
+    Parameters
+    ----------
+    indices : list
+        Indices of the cases in get_cases.
+    rounds : int
+        Amount of rounds.
+    timings : list
+        Every measured value by benchmark, for every case, appended to.
+
+    """
+    for _ in range(rounds):
+        with ProcessPoolExecutor(1, mp_context=get_context('spawn')) as pool:
+            measured = pool.submit(measure_round, indices).result()
+        for index, measurements in measured.items():
+            for benchmark, value in measurements.items():
+                timings[index].setdefault(benchmark, []).append(value)
+
+
+def get_results(cases, timings, memory):
+    """
+    Combines the measurements into results, keeping the best round.
+
+    Returns
+    -------
+    results : list
+        One dict per measurement, with the geometry, position,
+        benchmark name, value and noise: how much the second best round
+        differs from the best.
+
+    """
+    results = []
+    for case, timing, memory_used in zip(cases, timings, memory):
+        size, n, depth, position = case[:4]
+        measurements = {}
+        for benchmark, values in timing.items():
+            values = sorted(values, reverse=higher_is_better(benchmark))
+            best, second = values[0], values[min(1, len(values) - 1)]
+            measurements[benchmark] = best, (max(best, second) / min(best, second)
+                                             if best and second else 1)
+        for benchmark, value in memory_used.items():
+            measurements[benchmark] = value, 1
+        for benchmark, (value, noise) in measurements.items():
+            results.append({'size': size, 'n': n, 'depth': depth,
+                            'position': position, 'benchmark': benchmark,
+                            'value': value, 'noise': noise})
+    return results
+
+
+def run(rounds=ROUNDS, previous=None):
+    """
+    Runs every benchmark on every geometry and reference position.
+    When earlier results are given, the positions with a benchmark which
+    seems to have regressed are measured in as many rounds again,
+    such that one unlucky round of measurements does not count.
+
+    Parameters
+    ----------
+    rounds : int, optional
+        Amount of rounds of the timings. The default is ROUNDS.
+    previous : list, optional
+        The results to compare with. The default is None.
+
+    Returns
+    -------
+    results : list
+        One dict per measurement, with the geometry, position,
+        benchmark name, value and noise.
+
+    """
+    cases = get_cases()
+    timings = [{} for _ in cases]
+    measure_rounds(range(len(cases)), rounds, timings)
+    memory = [memory_benchmarks(case[4], case[7], case[2]) for case in cases]
+    results = get_results(cases, timings, memory)
+
+    if previous is not None:
+        regressed = {key[:3] for key, _ in get_regressions(results, previous)}
+        indices = [index for index, case in enumerate(cases)
+                   if (case[0], case[1], case[3]) in regressed]
+        if indices:
+            measure_rounds(indices, rounds, timings)
+            results = get_results(cases, timings, memory)
+
+    values = {(result['size'], result['n'], result['position'],
+               result['benchmark']): result['value'] for result in results}
+    for size, n, _, position in (case[:4] for case in cases):
+        print(f'{size}x{size}/{n} {position:<10} '
+              f'{values[size, n, position, "time_to_first_move"]:8.4f} s first '
+              f'{values[size, n, position, "time_to_move"]:8.4f} s '
+              f'{values[size, n, position, "nodes_per_second"]:10,.0f} nodes/s '
+              f'{values[size, n, position, "peak_memory"] / 1024:8.0f} KiB peak')
+    return results
+
+
+def get_version():
+    """"Returns the current git commit, None outside a git repository."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def get_regressions(results, previous):
+    """
+    Finds every benchmark which has become slower or bigger
+    by more than REGRESSION and more than the noise of both measurements.
+    Timings are compared after dividing out the change in speed
+    of the machine as a whole.
+
+    Parameters
+    ----------
+    results : list
+        The current results.
+    previous : list
+        The results to compare with.
+
+    Returns
+    -------
+    regressions : list
+        Tuples of the key (size, n, position, benchmark) of every benchmark
+        which has regressed and how many times worse it has become.
+
+    """
+    def key(result):
+        return (result['size'], result['n'], result['position'],
+                result['benchmark'])
+
+    old = {key(result): result for result in previous}
+    ratios = {}
+    for result in results:
+        if key(result) not in old or result['benchmark'] == 'nodes':
+            continue
+        old_value = old[key(result)]['value']
+        ratio = result['value'] / old_value if old_value else 1
+        # Calls and positions per second should go up, the others down
+        if higher_is_better(result['benchmark']):
+            ratio = 1 / ratio if ratio else float('inf')
+        ratios[key(result)] = ratio
+
+    # The timings are relative to the speed of the whole machine,
+    # which is the median change of all timings
+    speed = median([ratio for (*_, benchmark), ratio in ratios.items()
+                    if is_timing(benchmark)] or [1])
+    regressions = []
+    for result in results:
+        if key(result) not in ratios:
+            continue
+        ratio = ratios[key(result)]
+        if is_timing(result['benchmark']):
+            ratio /= speed
+        if ratio > max(REGRESSION, result['noise'],
+                       old[key(result)].get('noise', 1)):
+            regressions.append((key(result), ratio))
+    return regressions
+
+
+def compare(results, previous):
+    """
+    Prints every benchmark which has regressed, see get_regressions.
+
+    Returns
+    -------
+    regressions : int
+        Amount of benchmarks which have regressed.
+
+    """
+    regressions = get_regressions(results, previous)
+    for (size, n, position, benchmark), ratio in regressions:
+        print(f'Regression {size}x{size}/{n} {position} {benchmark}: '
+              f'{ratio:.2f}x worse')
+    return len(regressions)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('-o', '--output', default='benchmark.json',
+                        help='file to write the results to')
+    parser.add_argument('-c', '--compare', help='earlier results to compare with')
+    args = parser.parse_args()
+
+    previous = None
+    if args.compare is not None:
+        with open(args.compare) as file:
+            previous = json.load(file)['results']
+
+    results = run(previous=previous)
+    with open(args.output, 'w') as file:
+        json.dump({'version': get_version(), 'python': platform.python_version(),
+                   'machine': platform.machine(), 'results': results},
+                  file, indent=1)
+
+    if previous is not None:
+        sys.exit(1 if compare(results, previous) else 0)
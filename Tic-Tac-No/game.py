@@ -1,8 +1,580 @@
+import json
+import mmap
+import multiprocessing
 import numpy as np
-from time import sleep
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from math import log, nextafter, sqrt
+from time import perf_counter, sleep, time
+
+BOARD_SIZE = 3  # Default size of one side of a board, a board is always a square
+GAME_N = 3  # Default amount of squares in a line needed to win
+TABLE_SIZE = 2 ** 16  # Default amount of entries in the transposition table
+TIME_LIMIT = 2  # Seconds the AI may think about one move
+EXPLORATION = sqrt(2)  # Exploration constant of the UCT formula
+TABLEBASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TABLEBASE_MAGIC = b'TTNB'
+
+# Results of a tablebase entry, for the player to move
+LOSS, DRAW, WIN = 0, 1, 2
+
+# Bound types of a transposition table entry
+EXACT, LOWER, UPPER = 0, 1, 2
+SIDE_KEY = random.Random('side').getrandbits(64)  # Hashed in when minimizing
+
+
+class Geometry:
+    """
+    Precomputed bitmasks for one board geometry.
+    Square (row, column) is represented by bit row * size + column.
+
+    Attributes:
+        size (int):
+            Size of one side of the board.
+        n (int):
+            Amount of squares in a line needed to win.
+        squares (list):
+            All (row, column) squares in row-major order.
+        bits (list):
+            Bitmask of every square, indexed by square number.
+        full (int):
+            Bitmask with every square of the board set.
+        win_masks (list):
+            Bitmasks of every line of n squares.
+        square_lines (list):
+            Bitmasks of the lines through every square, by square number.
+        centre_order (list):
+            (square, bit) of every square, ordered from the centre outwards.
+        centre_rank (dict):
+            Index of every square in centre_order.
+        transforms (list):
+            The 8 symmetries (rotations and reflections) of the board,
+            each as a list which maps a square number to its image.
+        inverse_transforms (list):
+            The inverse of every transform.
+        powers (list):
+            For every transform the power of 3 of the image of every square,
+            used to number positions in a tablebase.
+    """
+
+    def __init__(self, size, n):
+        """"Constructor."""
+        self.size = size
+        self.n = n
+        self.squares = [(row, column) for row in range(size)
+                        for column in range(size)]
+        self.bits = [1 << i for i in range(size * size)]
+        self.full = (1 << size * size) - 1
+        self.win_masks = self.create_win_masks()
+        self.square_lines = [[mask for mask in self.win_masks if mask & bit]
+                             for bit in self.bits]
+        centre = (size - 1) / 2
+        self.centre_order = sorted(
+            zip(self.squares, self.bits),
+            key=lambda item: (abs(item[0][0] - centre) + abs(item[0][1] - centre),
+                              item[0]))
+        self.centre_rank = {square: rank for rank, (square, _)
+                            in enumerate(self.centre_order)}
+        self.transforms = self.create_transforms()
+        self.inverse_transforms = []
+        for transform in self.transforms:
+            inverse = [0] * len(transform)
+            for number, image in enumerate(transform):
+                inverse[image] = number
+            self.inverse_transforms.append(inverse)
+        self.powers = [[3 ** image for image in transform]
+                       for transform in self.transforms]
+        self.zobrist_keys = {}
+
+    def create_win_masks(self):
+        """
+        Creates a bitmask for every line of n squares on the board.
+
+        Returns
+        -------
+        masks : list
+            Bitmasks of the horizontal, vertical and diagonal lines.
+
+        """
+        masks = []
+        for row in range(self.size):
+            for column in range(self.size):
+                # Right, down, down-right and down-left
+                for d_row, d_column in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_row = row + d_row * (self.n - 1)
+                    end_column = column + d_column * (self.n - 1)
+                    if not (0 <= end_row < self.size
+                            and 0 <= end_column < self.size):
+                        continue
+                    mask = 0
+                    for i in range(self.n):
+                        mask |= 1 << ((row + d_row * i) * self.size
+                                      + column + d_column * i)
+                    masks.append(mask)
+        return masks
+
+    def create_transforms(self):
+        """
+        Creates the 8 symmetries of the square board.
+        The first transform is the identity.
+
+        Returns
+        -------
+        transforms : list
+            For every symmetry a list which maps a square number to its image.
+
+        """
+        last = self.size - 1
+        images = (lambda r, c: (r, c), lambda r, c: (c, last - r),
+                  lambda r, c: (last - r, last - c), lambda r, c: (last - c, r),
+                  lambda r, c: (r, last - c), lambda r, c: (last - r, c),
+                  lambda r, c: (c, r), lambda r, c: (last - c, last - r))
+        return [[self.square_number(image(row, column))
+                 for row, column in self.squares] for image in images]
+
+    def square_number(self, square):
+        """"Returns the bit index of a (row, column) square."""
+        row, column = square
+        return row * self.size + column
+
+    def transform_square(self, square, transform, inverse=False):
+        """
+        Maps a square to its image under one of the symmetries.
+
+        Parameters
+        ----------
+        square : (int, int)
+            Coordinates of a square on the board.
+        transform : int
+            Index of the symmetry in self.transforms.
+        inverse : bool, optional
+            Apply the inverse of the symmetry. The default is False.
+
+        Returns
+        -------
+        (int, int)
+            Coordinates of the image.
+
+        """
+        transforms = self.inverse_transforms if inverse else self.transforms
+        return self.squares[transforms[transform][self.square_number(square)]]
+
+    def position_index(self, mine, theirs):
+        """
+        Numbers a position as a base 3 number, with a digit per square:
+        0 for an open square, 1 for the player to move and 2 for the opponent.
+        Of the 8 symmetric forms the one with the lowest number is used.
+
+        Parameters
+        ----------
+        mine : int
+            Bitmask of the squares of the player to move.
+        theirs : int
+            Bitmask of the squares of the opponent.
+
+        Returns
+        -------
+        int
+            Index of the canonical form of the position.
+        int
+            Index of the transform which maps the position to that form.
+
+        """
+        indices = []
+        for powers in self.powers:
+            index = 0
+            for number, power in enumerate(powers):
+                if mine >> number & 1:
+                    index += power
+                elif theirs >> number & 1:
+                    index += 2 * power
+            indices.append(index)
+        index = min(indices)
+        return index, indices.index(index)
+
+    def get_zobrist_keys(self, symbol):
+        """
+        Returns the Zobrist keys of a player, one random 64-bit key per square.
+        The keys are seeded with the board size, n and symbol,
+        so a position always hashes to the same value, and the same stones
+        hash differently under other rules.
+        Every square gets the keys of its images under the 8 symmetries,
+        such that the hashes of all symmetric positions can be kept up to date.
+
+        Parameters
+        ----------
+        symbol : str
+            Symbol of the player.
+
+        Returns
+        -------
+        list
+            Tuple of Zobrist keys of every square, indexed by square number
+            and then by transform.
+
+        """
+        if symbol not in self.zobrist_keys:
+            rng = random.Random(f'{self.size} {self.n} {symbol}')
+            keys = [rng.getrandbits(64) for _ in self.bits]
+            self.zobrist_keys[symbol] = [
+                tuple(keys[transform[number]] for transform in self.transforms)
+                for number in range(len(self.bits))]
+        return self.zobrist_keys[symbol]
+
+
+@lru_cache(maxsize=None)
+def get_geometry(size, n):
+    """
+    Returns the (cached) geometry for a board size and line length.
+
+    Parameters
+    ----------
+    size : int
+        Size of one side of the board.
+    n : int
+        Amount of squares in a line needed to win.
+
+    Returns
+    -------
+    Geometry
+        Precomputed bitmasks for the geometry.
+
+    """
+    return Geometry(size, n)
+
+
+class SearchTimeout(Exception):
+    """Raised inside a search when its time budget has run out."""
+
+
+class SearchStats:
+    """
+    Statistics of one search of MiniMaxPlayer.
+    The totals are always counted, the statistics per ply (moves below
+    the root), of the transposition table and of the moves at the root
+    only when the player is instrumented.
+
+    Attributes:
+        root_empty (int):
+            Amount of empty squares at the root of the search.
+        nodes (int):
+            Amount of positions visited.
+        cutoffs (int):
+            Amount of alpha-beta cutoffs.
+        depth (int):
+            Depth of the deepest completed search, 0 for a tablebase move.
+        move ((int, int)):
+            The chosen move.
+        seconds (float):
+            Duration of the search.
+        instrumented (bool):
+            Whether the detailed statistics below have been counted.
+        ply_nodes (list):
+            Amount of positions visited per ply.
+        ply_cutoffs (list):
+            Amount of alpha-beta cutoffs per ply.
+        terminals (int):
+            Amount of positions in which the game was over.
+        expanded (int):
+            Amount of positions of which the moves were searched.
+        table_probes (int):
+            Amount of lookups in the transposition table.
+        table_hits (int):
+            Amount of lookups which found an entry.
+        root_moves (dict):
+            [positions, seconds] spent on every move at the root.
+    """
+
+    def __init__(self, root_empty, instrumented=False):
+        """"Constructor."""
+        self.root_empty = root_empty
+        self.nodes = 0
+        self.cutoffs = 0
+        self.depth = 0
+        self.move = None
+        self.seconds = 0
+        self.instrumented = instrumented
+        self.ply_nodes = []
+        self.ply_cutoffs = []
+        self.terminals = 0
+        self.expanded = 0
+        self.table_probes = 0
+        self.table_hits = 0
+        self.root_moves = {}
+
+    def count_node(self, ply):
+        """Counts a visited position at a ply."""
+        if ply == len(self.ply_nodes):
+            self.ply_nodes.append(0)
+            self.ply_cutoffs.append(0)
+        self.ply_nodes[ply] += 1
+
+    def count_root_move(self, square, nodes, seconds):
+        """Adds the positions and seconds spent on a move at the root."""
+        spent = self.root_moves.setdefault(square, [0, 0])
+        spent[0] += nodes
+        spent[1] += seconds
+
+    def get_hit_rate(self):
+        """Getter for the fraction of the table lookups which found an entry."""
+        return self.table_hits / self.table_probes if self.table_probes else 0
+
+    def get_branching_factor(self):
+        """Getter for the average amount of moves searched per position."""
+        if not self.expanded:
+            return 0
+        return (sum(self.ply_nodes) - self.ply_nodes[0]) / self.expanded
+
+    def to_dict(self):
+        """
+        Converts the statistics to builtin types, for a JSON dump.
+
+        Returns
+        -------
+        stats : dict
+            The statistics, with the detailed ones only if instrumented.
+
+        """
+        stats = {'move': self.move, 'depth': self.depth,
+                 'seconds': self.seconds, 'nodes': self.nodes,
+                 'cutoffs': self.cutoffs}
+        if self.instrumented:
+            stats.update({
+                'ply_nodes': self.ply_nodes, 'ply_cutoffs': self.ply_cutoffs,
+                'terminals': self.terminals,
+                'table_probes': self.table_probes,
+                'table_hits': self.table_hits,
+                'hit_rate': self.get_hit_rate(),
+                'branching_factor': self.get_branching_factor(),
+                'root_moves': [{'move': square, 'nodes': nodes,
+                                'seconds': seconds}
+                               for square, (nodes, seconds)
+                               in self.root_moves.items()]})
+        return stats
+
+    def dump(self, path):
+        """
+        Appends the statistics as one JSON line to a trace file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the trace file.
+
+        """
+        with open(path, 'a') as file:
+            file.write(json.dumps(self.to_dict()) + '\n')
+
+    def __str__(self):
+        """"Returns a one line summary of the search."""
+        summary = (f'move {self.move}, depth {self.depth}, '
+                   f'{self.nodes} positions, {self.cutoffs} cutoffs, '
+                   f'{self.seconds:.3f} s')
+        if self.instrumented:
+            summary += (f', hit rate {self.get_hit_rate():.2f}, '
+                        f'branching factor {self.get_branching_factor():.2f}')
+        return summary
+
+
+def open_lines_evaluation(board, player, other_player):
+    """
+    Static evaluation of a position which has not been decided yet.
+    Every line of n squares which the opponent has not blocked
+    counts for a player, weighted by how many squares of it they already have.
+
+    Parameters
+    ----------
+    board : BitBoard
+        The playing board.
+    player : PlayerInterface
+        The player for who to evaluate.
+    other_player : PlayerInterface
+        The opponent of player.
+
+    Returns
+    -------
+    float
+        Value between -0.5 and 0.5, positive if player is better off.
+
+    """
+    mine = board.get_mask(player)
+    theirs = board.get_mask(other_player)
+    score = 0
+    for win_mask in board.geometry.win_masks:
+        if not win_mask & theirs:
+            score += (win_mask & mine).bit_count() ** 2
+        elif not win_mask & mine:
+            score -= (win_mask & theirs).bit_count() ** 2
+    return score / (2 * len(board.geometry.win_masks) * board.geometry.n ** 2)
+
+
+class TranspositionTable:
+    """
+    Fixed-size table of searched positions, indexed by their Zobrist hash.
+    Every entry is a tuple (key, depth, value, bound, move).
+    When two positions map to the same slot, the one searched deepest is kept.
+
+    Attributes:
+        size (int):
+            Maximum amount of entries.
+        entries (list):
+            The stored entries, None for an empty slot.
+    """
+
+    def __init__(self, size=TABLE_SIZE):
+        """"Constructor."""
+        self.size = size
+        self.entries = [None] * size
+
+    def get(self, key):
+        """
+        Looks up a position.
+
+        Parameters
+        ----------
+        key : int
+            Zobrist hash of the position.
+
+        Returns
+        -------
+        tuple or None
+            The entry of the position, None if it is not stored.
+
+        """
+        entry = self.entries[key % self.size]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key, depth, value, bound, move):
+        """
+        Stores a searched position.
+        An entry of another position is only replaced by a search
+        that is at least as deep.
+
+        Parameters
+        ----------
+        key : int
+            Zobrist hash of the position.
+        depth : int
+            Amount of moves searched below the position.
+        value : int
+            Value of the position.
+        bound : int
+            EXACT, LOWER or UPPER, depending on the alpha-beta window.
+        move : (int, int)
+            Best move found in the position.
+
+        """
+        index = key % self.size
+        entry = self.entries[index]
+        if entry is None or entry[0] == key or depth >= entry[1]:
+            self.entries[index] = (key, depth, value, bound, move)
+
+    def clear(self):
+        """Removes all entries."""
+        self.entries = [None] * self.size
 
-BOARD_SIZE = 3  # Size of one size of the board, the board is always a square
-GAME_N = 3  # Amount of squares in a line needed to win
+
+class Tablebase:
+    """
+    Perfect-play results of every reachable position of one geometry,
+    read from a binary file which is created by tablebase.py.
+    The file starts with TABLEBASE_MAGIC, the board size and GAME_N,
+    followed by one byte per canonical position index:
+    the result (LOSS, DRAW or WIN) times 16 plus the square number of the
+    best move in the canonical form, or 0xFF for positions without entry.
+    The file is memory-mapped, so looking up a move does not read it whole.
+
+    Attributes:
+        geometry (Geometry):
+            The geometry of the positions in the table.
+        data (mmap.mmap):
+            The memory-mapped file.
+    """
+
+    def __init__(self, path, geometry):
+        """
+        Opens a tablebase file.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file.
+        geometry : Geometry
+            The geometry the file has to be created for.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a tablebase of the geometry.
+
+        """
+        self.geometry = geometry
+        with open(path, 'rb') as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = TABLEBASE_MAGIC + bytes((geometry.size, geometry.n))
+        if (self.data[:len(header)] != header
+                or len(self.data) != len(header) + 3 ** len(geometry.squares)):
+            raise ValueError(f'{path} is not a tablebase of this board.')
+        self.offset = len(header)
+
+    def lookup(self, mine, theirs):
+        """
+        Looks up the result and best move of a position.
+
+        Parameters
+        ----------
+        mine : int
+            Bitmask of the squares of the player to move.
+        theirs : int
+            Bitmask of the squares of the opponent.
+
+        Returns
+        -------
+        int
+            LOSS, DRAW or WIN for the player to move.
+        (int, int)
+            The best move, None if the position is not in the table.
+
+        """
+        index, transform = self.geometry.position_index(mine, theirs)
+        entry = self.data[self.offset + index]
+        if entry == 0xFF:
+            return None, None
+        number = self.geometry.inverse_transforms[transform][entry & 15]
+        return entry >> 4, self.geometry.squares[number]
+
+
+def get_tablebase_path(size, n):
+    """"Returns the path of the tablebase file of a geometry."""
+    return os.path.join(TABLEBASE_DIR, f'tablebase_{size}_{n}.bin')
+
+
+@lru_cache(maxsize=None)
+def get_tablebase(size, n):
+    """
+    Returns the (cached) tablebase of a geometry.
+
+    Parameters
+    ----------
+    size : int
+        Size of one side of the board.
+    n : int
+        Amount of squares in a line needed to win.
+
+    Returns
+    -------
+    Tablebase
+        The tablebase, None if there is no tablebase file for the geometry.
+
+    """
+    path = get_tablebase_path(size, n)
+    if not os.path.exists(path):
+        return None
+    return Tablebase(path, get_geometry(size, n))
 
 
 class PlayerInterface:
@@ -16,6 +588,8 @@ class PlayerInterface:
             player's name
     """
 
+    __slots__ = ('symbol', 'name')
+
     def __init__(self, symbol):
         """"Constructor."""
         self.symbol = symbol
@@ -56,6 +630,8 @@ class HumanPlayer(PlayerInterface):
     Class for the human player
     """
 
+    __slots__ = ()
+
     def set_name(self):
         """Setter for the attribute name."""
         return 'Player'
@@ -74,102 +650,978 @@ class HumanPlayer(PlayerInterface):
         """
         number = int(input(
             f'{self.name}, which square would you like to play? >> ')) - 1
-        return number // BOARD_SIZE, number % BOARD_SIZE
+        size = board.geometry.size
+        return number // size, number % size
+
+
+class RandomPlayer(PlayerInterface):
+    """
+    Class for a player which plays a random open square,
+    a baseline for the AI players.
+
+    Attributes:
+        rng (random.Random):
+            Random generator of the moves.
+    """
+
+    __slots__ = ('rng',)
+
+    def __init__(self, symbol, seed=None):
+        """"Constructor."""
+        super().__init__(symbol)
+        self.rng = random.Random(seed)
+
+    def set_name(self):
+        """Setter for the attribute name."""
+        return 'Random'
+
+    def play(self, board):
+        """
+        Picks a random open square.
+
+        Returns
+        -------
+        int
+            Row of the next move's square.
+        int
+            Column of the next move's square.
+
+        """
+        return self.rng.choice(board.get_open_squares())
 
 
 class MiniMaxPlayer(PlayerInterface):
     """
     Class for the AI player
+
+    Attributes:
+        table (TranspositionTable):
+            Positions which have already been searched.
+        time_limit (float):
+            Seconds the AI may think about one move, None for no limit.
+        max_depth (int):
+            Maximum amount of moves to look ahead, None for no limit.
+        evaluate (callable):
+            Static evaluation of a position at the maximum depth,
+            called as evaluate(board, player, other_player)
+            and returning a value between -1 and 1.
+        use_tablebase (bool):
+            Whether to look moves up in the tablebase of the board,
+            if there is one, instead of searching.
+        delay (float):
+            Seconds to wait before making a move.
+        workers (int):
+            Amount of processes to split the moves at the root over,
+            None to search in this process only.
+        pool (ProcessPoolExecutor):
+            The worker processes, started at the first parallel search.
+        shared_alpha (multiprocessing.Value):
+            Best value found at the root, shared with the workers.
+        instrument (bool):
+            Whether to count the detailed statistics of every search.
+        trace (str):
+            Path of a file to append the statistics of every search to,
+            as JSON lines, None for no trace.
+        stats (SearchStats):
+            Statistics of the current or last search.
+        deadline (float):
+            perf_counter time at which the current search has to stop.
+        cancelled (bool):
+            Whether the search has been cancelled with cancel.
+            It is not cleared by a search, but before one is started.
+        killers (dict):
+            Last two moves which caused a cutoff, by amount of empty squares.
+        history (dict):
+            Score of every square, increased whenever it causes a cutoff,
+            for the maximizing (True) and minimizing (False) player.
     """
 
+    __slots__ = ('other_player', 'table', 'time_limit', 'max_depth', 'evaluate',
+                 'use_tablebase', 'delay', 'workers', 'pool', 'shared_alpha',
+                 'instrument', 'trace', 'stats', 'deadline', 'cancelled',
+                 'killers', 'history')
+
+    def __init__(self, symbol, table_size=TABLE_SIZE, time_limit=None,
+                 max_depth=None, evaluate=open_lines_evaluation,
+                 use_tablebase=True, delay=0, workers=None, instrument=False,
+                 trace=None):
+        """"Constructor."""
+        super().__init__(symbol)
+        self.table = TranspositionTable(table_size)
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.evaluate = evaluate
+        self.use_tablebase = use_tablebase
+        self.delay = delay
+        self.workers = workers
+        self.pool = None
+        self.shared_alpha = None
+        self.instrument = instrument or trace is not None
+        self.trace = trace
+        self.stats = SearchStats(0)
+        self.deadline = None
+        self.cancelled = False
+        self.killers = {}
+        self.history = {True: {}, False: {}}
+
     def set_name(self):
         """Setter for the attribute name."""
         return 'AI'
 
     def set_other_player(self, other_player):
         """
-        Setter for the attribute other player.
+        Setter for the attribute other player.
+
+        Parameters
+        ----------
+        other_player : PlayerInterface
+            The opponent of self.
+
+        """
+        self.other_player = other_player
+
+    def minimax(self, board, maximizing, alpha, beta, depth=None):
+        """
+        Applying minimax (with alpha-beta pruning) on the game.
+        Without a depth this searches until the end of the game, so it will
+        become very slow when expanding the board size.
+        At depth 0 an undecided position gets the value of self.evaluate.
+        Searched positions are stored in the transposition table,
+        so positions reached by another move order are not searched again.
+        Positions are looked up by their canonical form, so the symmetric
+        copies of a position share one entry.
+        Moves are played and taken back on the board itself,
+        so the board is the same before and after the search.
+        Of the moves with the best value at the root, the one nearest the
+        centre is returned, whatever order the moves are searched in.
+
+        Parameters
+        ----------
+        board : BitBoard
+            The playing board.
+        maximizing : bool
+            Whether it is the maximizing or minimizing player's turn.
+        alpha : int
+            Aplha-value.
+        beta : int
+            Beta-value.
+        depth : int, optional
+            Amount of moves to look ahead. The default is None,
+            which searches until the end of the game.
+
+        Raises
+        ------
+        SearchTimeout
+            If self.deadline has passed or the search has been cancelled.
+
+        Returns
+        -------
+        int
+            Value of the move.
+        (int, int)
+            Move corresponding the the square on the board.
+
+        """
+        # Checking the clock and whether the search has been cancelled
+        # every 1024 positions
+        stats = self.stats
+        stats.nodes += 1
+        if not stats.nodes & 1023 and (
+                self.cancelled or self.deadline is not None
+                and perf_counter() > self.deadline):
+            raise SearchTimeout
+        instrument = self.instrument
+        if instrument:
+            ply = stats.root_empty - board.empty_count
+            stats.count_node(ply)
+
+        winner = board.get_winner()
+        if winner is not None:
+            if instrument:
+                stats.terminals += 1
+            return (1 if winner == self else -1), None
+        elif board.is_full():
+            if instrument:
+                stats.terminals += 1
+            return 0, None
+        elif depth == 0:
+            return self.evaluate(board, self, self.other_player), None
+
+        if depth is None or depth > board.empty_count:
+            depth = board.empty_count
+        at_root = maximizing and board.empty_count == stats.root_empty
+
+        # Looking up the canonical form of the position in the transposition
+        # table, moves are stored as squares of the canonical form.
+        # At the root the entry only orders the moves, as its move may have
+        # been chosen among equal moves without the tie-break of the root
+        key, transform = board.canonical_hash()
+        if not maximizing:
+            key ^= SIDE_KEY
+        entry = self.table.get(key)
+        tt_move = None
+        if instrument:
+            stats.table_probes += 1
+            stats.table_hits += entry is not None
+        if entry is not None:
+            tt_depth, tt_value, bound, tt_move = entry[1:]
+            tt_move = board.geometry.transform_square(tt_move, transform,
+                                                      inverse=True)
+            if tt_depth >= depth and not at_root:
+                if bound == EXACT:
+                    return tt_value, tt_move
+                elif bound == LOWER:
+                    alpha = max(tt_value, alpha)
+                else:
+                    beta = min(tt_value, beta)
+                if alpha >= beta:
+                    return tt_value, tt_move
+        squares = self.order_moves(board, maximizing, tt_move)
+        alpha_start, beta_start = alpha, beta
+        # Time and positions spent on every move at the root
+        root = instrument and ply == 0
+        rank = board.geometry.centre_rank
+        if instrument:
+            stats.expanded += 1
+
+        if maximizing:  # Maximizing player
+            value = float('-inf')
+            move = None
+            for square in squares:
+                if root:
+                    start, nodes = perf_counter(), stats.nodes
+                # At the root a square nearer the centre than the best move
+                # is searched just below alpha, so an equal value is exact
+                closer = (at_root and move is not None
+                          and rank[square] < rank[move])
+                board.make_move(square, self)
+                new_value, new_move = self.minimax(
+                    board, not maximizing,
+                    nextafter(alpha, float('-inf')) if closer else alpha,
+                    beta, depth - 1)
+                board.undo_move()
+                if root:
+                    stats.count_root_move(square, stats.nodes - nodes,
+                                          perf_counter() - start)
+                alpha = max(new_value, alpha)
+                if new_value > value or closer and new_value == value:
+                    value = new_value
+                    move = square
+                # Alpha-Beta pruning step
+                if alpha >= beta:
+                    break
+
+        else:  # Minimizing player
+            value = float('inf')
+            move = None
+            for square in squares:
+                if root:
+                    start, nodes = perf_counter(), stats.nodes
+                board.make_move(square, self.other_player)
+                new_value, new_move = self.minimax(
+                    board, not maximizing, alpha, beta, depth - 1)
+                board.undo_move()
+                if root:
+                    stats.count_root_move(square, stats.nodes - nodes,
+                                          perf_counter() - start)
+                beta = min(new_value, beta)
+                if new_value < value:
+                    value = new_value
+                    move = square
+                # Alpha-Beta pruning step
+                if alpha >= beta:
+                    break
+
+        if alpha >= beta:
+            self.store_cutoff(board, maximizing, move, depth)
+            if instrument:
+                stats.ply_cutoffs[ply] += 1
+
+        # Storing the result, with the bound it has under the alpha-beta window
+        if value <= alpha_start:
+            bound = UPPER
+        elif value >= beta_start:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.table.store(key, depth, value, bound,
+                         board.geometry.transform_square(move, transform))
+        return value, move
+
+    def order_moves(self, board, maximizing, tt_move):
+        """
+        Orders the open squares such that the best moves are likely searched
+        first, which lets alpha-beta prune more of the tree.
+        The order is: the best move from the transposition table,
+        the killer moves of this depth, the other squares by history score
+        and finally from the centre outwards.
+        When the position is symmetric, every set of symmetric squares is
+        searched once, where its first square comes, as the square of the set
+        nearest the centre; the others lead to the same result.
+
+        Parameters
+        ----------
+        board : BitBoard
+            The playing board.
+        maximizing : bool
+            Whether it is the maximizing or minimizing player's turn.
+        tt_move : (int, int)
+            Best move from the transposition table, None if there is none.
+
+        Returns
+        -------
+        squares : list
+            The open squares in the order they should be searched.
+
+        """
+        squares = board.get_open_squares(centre_first=True)
+        history = self.history[maximizing]
+        if history:
+            squares.sort(key=lambda square: history.get(square, 0),
+                         reverse=True)
+        first = []
+        for square in (tt_move, *self.killers.get(board.empty_count, ())):
+            if square is not None and square not in first and board.move_is_valid(square):
+                first.append(square)
+                squares.remove(square)
+        squares = first + squares
+
+        symmetries = board.get_symmetries()
+        if symmetries:
+            geometry = board.geometry
+            unique = []
+            seen = set()
+            for square in squares:
+                number = geometry.square_number(square)
+                if number not in seen:
+                    images = {geometry.transforms[transform][number]
+                              for transform in symmetries}
+                    images.add(number)
+                    unique.append(min((geometry.squares[image]
+                                       for image in images),
+                                      key=geometry.centre_rank.get))
+                    seen.update(images)
+            squares = unique
+        return squares
+
+    def store_cutoff(self, board, maximizing, square, depth):
+        """
+        Remembers a move which caused an alpha-beta cutoff
+        as killer move and in the history scores.
+
+        Parameters
+        ----------
+        board : BitBoard
+            The playing board.
+        maximizing : bool
+            Whether it is the maximizing or minimizing player's turn.
+        square : (int, int)
+            The move which caused the cutoff.
+        depth : int
+            Amount of moves searched below the position.
+
+        """
+        self.stats.cutoffs += 1
+        killers = self.killers.get(board.empty_count, ())
+        if square not in killers:
+            self.killers[board.empty_count] = (square, *killers[:1])
+        history = self.history[maximizing]
+        history[square] = history.get(square, 0) + depth * depth
+
+    def new_search(self, board):
+        """
+        Starts new statistics and resets the killer moves before a search.
+        History scores of earlier searches are halved.
+
+        Parameters
+        ----------
+        board : Board
+            The position at the root of the search.
+
+        """
+        self.stats = SearchStats(board.empty_count, self.instrument)
+        self.deadline = None
+        self.killers = {}
+        for history in self.history.values():
+            for square in history:
+                history[square] //= 2
+
+    def play(self, board):
+        """
+        Gets the AI's next move.
+
+        Returns
+        -------
+        int
+            Row of the next move's square.
+        int
+            Column of the next move's square.
+
+        """
+        sleep(self.delay)
+        return self.search(board)[0]
+
+    def search(self, board):
+        """
+        Searches the best move, in the tablebase if there is one,
+        otherwise with (iteratively deepened) minimax.
+        If self.trace is set, the statistics are appended to it.
+        A plain Board is searched as a BitBoard.
+
+        Parameters
+        ----------
+        board : Board
+            The playing board, which is not changed.
+
+        Returns
+        -------
+        move : (int, int)
+            The best move.
+        stats : SearchStats
+            Statistics of the search.
+
+        """
+        start = perf_counter()
+        board = get_bit_board(board)
+        self.new_search(board)
+        move = None
+        if self.use_tablebase:
+            tablebase = get_tablebase(board.geometry.size, board.geometry.n)
+            if tablebase is not None:
+                move = tablebase.lookup(board.get_mask(self),
+                                        board.get_mask(self.other_player))[1]
+
+        if move is None:
+            board = board.get_board_copy()
+            if self.time_limit is None and self.max_depth is None:
+                move = self.search_root(board)[1]
+                self.stats.depth = board.empty_count
+            else:
+                move = self.iterative_deepening(board)
+
+        stats = self.stats
+        stats.move = move
+        stats.seconds = perf_counter() - start
+        if self.trace is not None:
+            stats.dump(self.trace)
+        return move, stats
+
+    def search_root(self, board, depth=None):
+        """
+        Searches the position for the best move,
+        in parallel if self.workers is set.
+
+        Parameters
+        ----------
+        board : BitBoard
+            The playing board.
+        depth : int, optional
+            Amount of moves to look ahead. The default is None,
+            which searches until the end of the game.
+
+        Returns
+        -------
+        int
+            Value of the move.
+        (int, int)
+            Move corresponding the the square on the board.
+
+        """
+        if self.workers is not None and self.workers > 1:
+            return self.parallel_search(board, depth)
+        return self.minimax(board, True, float('-inf'), float('inf'), depth)
+
+    def parallel_search(self, board, depth=None):
+        """
+        Splits the moves at the root over a pool of worker processes
+        (Young Brothers Wait): the first move is searched on its own,
+        after which the other moves are searched in parallel.
+        Whenever a worker finds a better move, it raises the alpha-value
+        which is shared with the workers that start after it.
+        Of the moves with the best value the one nearest the centre is
+        returned, as minimax does, so both return the same move when they
+        find the same values.
+        Of the statistics only the totals are counted, over all workers.
+
+        Parameters
+        ----------
+        board : BitBoard
+            The playing board.
+        depth : int, optional
+            Amount of moves to look ahead. The default is None,
+            which searches until the end of the game.
+
+        Raises
+        ------
+        SearchTimeout
+            If a worker ran out of time or the search has been cancelled.
+
+        Returns
+        -------
+        int
+            Value of the move.
+        (int, int)
+            Move corresponding the the square on the board.
+
+        """
+        if self.cancelled:
+            raise SearchTimeout
+        if depth is None or depth > board.empty_count:
+            depth = board.empty_count
+        key, transform = board.canonical_hash()
+        entry = self.table.get(key)
+        tt_move = None
+        if entry is not None:
+            tt_depth, tt_value, bound, tt_move = entry[1:]
+            tt_move = board.geometry.transform_square(tt_move, transform,
+                                                      inverse=True)
+            if tt_depth >= depth and bound == EXACT:
+                return tt_value, tt_move
+        squares = self.order_moves(board, True, tt_move)
+
+        if self.pool is None:
+            self.shared_alpha = multiprocessing.Value('d', float('-inf'))
+            settings = (self.symbol, self.other_player.get_symbol(),
+                        self.table.size, self.evaluate)
+            self.pool = ProcessPoolExecutor(self.workers,
+                                            initializer=_init_worker,
+                                            initargs=(settings, self.shared_alpha))
+        self.shared_alpha.value = float('-inf')
+        geometry = board.geometry.size, board.geometry.n
+        # The squares of every player, as the history need not hold every move
+        masks = [(player.get_symbol(), board.masks[slot])
+                 for slot, player in enumerate(board.players)
+                 if player is not None]
+        deadline = None
+        if self.deadline is not None:
+            deadline = time() + self.deadline - perf_counter()
+
+        def submit(square, alpha=None):
+            return self.pool.submit(_search_root_move, geometry, masks, square,
+                                    depth, deadline, alpha)
+
+        # The eldest brother first, then all others at once
+        results = [submit(squares[0]).result()]
+        futures = [submit(square) for square in squares[1:]]
+        try:
+            results += [future.result() for future in futures]
+        finally:
+            for future in futures:
+                future.cancel()
+        if None in results:
+            raise SearchTimeout
+
+        # The move with the best value nearest the centre is played.
+        # A value which is not above the alpha-value the worker started with
+        # is only an upper bound, so a move which might be as good as the
+        # best move is searched again just below the best value
+        self.stats.nodes += sum(nodes for _, _, nodes in results)
+        best = max(value for value, alpha, _ in results if value > alpha)
+        rank = board.geometry.centre_rank
+        for i in sorted(range(len(squares)), key=lambda i: rank[squares[i]]):
+            value, alpha, _ = results[i]
+            if value >= best and value <= alpha:
+                result = submit(squares[i], nextafter(best, float('-inf')))
+                result = result.result()
+                if result is None:
+                    raise SearchTimeout
+                self.stats.nodes += result[2]
+                value = result[0]
+            if value == best:
+                break
+        move = squares[i]
+
+        self.table.store(key, depth, best, EXACT,
+                         board.geometry.transform_square(move, transform))
+        return best, move
+
+    def cancel(self):
+        """
+        Stops the current search from another thread, at its next clock check.
+        An iteratively deepened search returns the best move found so far,
+        a search without a time limit or maximum depth raises SearchTimeout.
+        Worker processes of a parallel search finish their move first.
+        A search which has not started yet stops as soon as it starts,
+        until self.cancelled is cleared for the next search.
+
+        """
+        self.cancelled = True
+
+    def close(self):
+        """Shuts down the worker processes of the parallel search."""
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    def iterative_deepening(self, board):
+        """
+        Searches one move deeper every iteration, until the game is decided,
+        self.max_depth is reached or self.time_limit has run out.
+
+        Parameters
+        ----------
+        board : BitBoard
+            The playing board, which is left in an undefined state
+            when the time runs out.
+
+        Returns
+        -------
+        (int, int)
+            Best move of the deepest iteration which has been completed.
+
+        """
+        max_depth = board.empty_count
+        if self.max_depth is not None:
+            max_depth = min(self.max_depth, max_depth)
+        if self.time_limit is not None:
+            self.deadline = perf_counter() + self.time_limit
+
+        move = board.get_open_squares()[0]
+        try:
+            for depth in range(1, max_depth + 1):
+                value, move = self.search_root(board, depth)
+                self.stats.depth = depth
+                # A won or lost game does not change when searching deeper
+                if abs(value) == 1:
+                    break
+        except SearchTimeout:
+            pass
+        finally:
+            self.deadline = None
+        return move
+
+
+_worker_player = None  # MiniMaxPlayer of a worker process
+_shared_alpha = None  # Alpha-value shared by the worker processes
+
+
+def _init_worker(settings, shared_alpha):
+    """
+    Creates the AI player of a worker process of the parallel search.
+
+    Parameters
+    ----------
+    settings : tuple
+        Symbol of the AI and of its opponent,
+        transposition table size and evaluation function.
+    shared_alpha : multiprocessing.Value
+        Best value found at the root.
+
+    """
+    global _worker_player, _shared_alpha
+    symbol, other_symbol, table_size, evaluate = settings
+    _worker_player = MiniMaxPlayer(symbol, table_size, evaluate=evaluate,
+                                   use_tablebase=False)
+    _worker_player.set_other_player(PlayerInterface(other_symbol))
+    _shared_alpha = shared_alpha
+
+
+def _search_root_move(geometry, masks, square, depth, deadline, alpha=None):
+    """
+    Searches one move at the root in a worker process.
+
+    Parameters
+    ----------
+    geometry : (int, int)
+        Size of one side of the board and amount of squares in a line needed to win.
+    masks : list
+        (symbol, bitmask) of the squares of every player on the board.
+    square : (int, int)
+        The move at the root to search.
+    depth : int
+        Amount of moves to look ahead from the root.
+    deadline : float
+        time() at which the search has to stop, None for no limit.
+    alpha : float, optional
+        Alpha-value to start from. The default is None,
+        which starts from the shared alpha-value.
+
+    Returns
+    -------
+    tuple or None
+        Value of the move, the alpha-value the search started with and the
+        amount of positions visited. None if the time ran out.
+
+    """
+    player = _worker_player
+    players = {player.get_symbol(): player,
+               player.other_player.get_symbol(): player.other_player}
+    board = BitBoard(size=geometry[0], n=geometry[1])
+    for symbol, mask in masks:
+        for played, bit in zip(board.geometry.squares, board.geometry.bits):
+            if mask & bit:
+                board.make_move(played, players[symbol])
+    board.make_move(square, player)
+
+    player.new_search(board)
+    if deadline is not None:
+        player.deadline = perf_counter() + deadline - time()
+    if alpha is None:
+        alpha = _shared_alpha.value
+    try:
+        value = player.minimax(board, False, alpha, float('inf'),
+                               depth - 1)[0]
+    except SearchTimeout:
+        return None
+    finally:
+        player.deadline = None
+
+    with _shared_alpha.get_lock():
+        if value > _shared_alpha.value:
+            _shared_alpha.value = value
+    return value, alpha, player.stats.nodes
+
+
+class MCTSNode:
+    """
+    Node of the search tree of MCTSPlayer.
+
+    Attributes:
+        parent (MCTSNode):
+            The node before the move, None for the root.
+        move (int):
+            Square number of the move leading to this node.
+        player (int):
+            Who made the move: 0 for the AI, 1 for its opponent.
+        children (list):
+            The nodes which have been expanded.
+        untried (list):
+            Square numbers of the moves which have not been expanded yet.
+        result (float):
+            1 if the move won the game, 0.5 if it filled the board,
+            None if the game goes on.
+        score (float):
+            Sum of the results of the playouts for the player who moved.
+        visits (int):
+            Amount of playouts through this node.
+    """
+
+    def __init__(self, parent, move, player, untried, result):
+        """"Constructor."""
+        self.parent = parent
+        self.move = move
+        self.player = player
+        self.children = []
+        self.untried = untried
+        self.result = result
+        self.score = 0
+        self.visits = 0
+
+    def select_child(self, exploration):
+        """
+        Selects the child with the highest UCT value.
+
+        Parameters
+        ----------
+        exploration : float
+            Exploration constant of the UCT formula.
+
+        Returns
+        -------
+        MCTSNode
+            The selected child.
+
+        """
+        log_visits = log(self.visits)
+        return max(self.children, key=lambda child: child.score / child.visits
+                   + exploration * sqrt(log_visits / child.visits))
+
+
+class MCTSPlayer(PlayerInterface):
+    """
+    AI player using Monte Carlo Tree Search with UCT selection
+    and random playouts on bitmasks, for boards too large for minimax.
+    The tree of the previous move is reused when the opponent's move
+    has already been expanded.
+
+    Attributes:
+        iterations (int):
+            Amount of playouts per move, None for no limit.
+        time_limit (float):
+            Seconds the AI may think about one move, None for no limit.
+        exploration (float):
+            Exploration constant of the UCT formula.
+        delay (float):
+            Seconds to wait before making a move.
+        rng (random.Random):
+            Random generator of the playouts.
+        root (MCTSNode):
+            The tree after the AI's last move, None at the start.
+        root_masks (tuple):
+            Geometry of the board and bitmasks of the AI and its opponent
+            at the root.
+    """
+
+    __slots__ = ('other_player', 'iterations', 'time_limit', 'exploration',
+                 'delay', 'rng', 'root', 'root_masks')
+
+    def __init__(self, symbol, iterations=None, time_limit=TIME_LIMIT,
+                 exploration=EXPLORATION, delay=0, seed=None):
+        """"Constructor."""
+        super().__init__(symbol)
+        if iterations is None and time_limit is None:
+            raise ValueError('MCTSPlayer needs iterations or a time_limit.')
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.delay = delay
+        self.rng = random.Random(seed)
+        self.root = None
+        self.root_masks = None
+
+    def set_name(self):
+        """Setter for the attribute name."""
+        return 'AI'
+
+    def set_other_player(self, other_player):
+        """
+        Setter for the attribute other player.
+
+        Parameters
+        ----------
+        other_player : PlayerInterface
+            The opponent of self.
+
+        """
+        self.other_player = other_player
+
+    def get_root(self, board, mine, theirs):
+        """
+        Returns the node of the current position.
+        That is the child of the previous root for the opponent's last move,
+        or a new tree if that move has not been expanded.
+
+        Parameters
+        ----------
+        board : BitBoard
+            The playing board.
+        mine : int
+            Bitmask of the squares of the AI.
+        theirs : int
+            Bitmask of the squares of the opponent.
+
+        Returns
+        -------
+        MCTSNode
+            Root of the search tree, with the AI to move.
+
+        """
+        if (self.root is not None and self.root_masks[0] is board.geometry
+                and self.root_masks[1] == mine):
+            move = self.root_masks[2] ^ theirs
+            for child in self.root.children:
+                if 1 << child.move == move:
+                    child.parent = None
+                    return child
+
+        occupied = mine | theirs
+        untried = [number for number, bit in enumerate(board.geometry.bits)
+                   if not occupied & bit]
+        return MCTSNode(None, None, 1, untried, None)
+
+    def iterate(self, root, geometry, mine, theirs):
+        """
+        One iteration of the search: selection, expansion,
+        a random playout and backpropagation of its result.
 
         Parameters
         ----------
-        other_player : PlayerInterface
-            The opponent of self.
+        root : MCTSNode
+            Root of the search tree.
+        geometry : Geometry
+            The geometry of the board.
+        mine : int
+            Bitmask of the squares of the AI.
+        theirs : int
+            Bitmask of the squares of the opponent.
 
         """
-        self.other_player = other_player
+        masks = [mine, theirs]
+        bits = geometry.bits
+
+        # Selection
+        node = root
+        while not node.untried and node.children:
+            node = node.select_child(self.exploration)
+            masks[node.player] |= bits[node.move]
+
+        # Expansion
+        if node.result is None and node.untried:
+            index = self.rng.randrange(len(node.untried))
+            move = node.untried[index]
+            node.untried[index] = node.untried[-1]
+            node.untried.pop()
+            player = 1 - node.player
+            masks[player] |= bits[move]
+            result = self.move_result(geometry, masks, player, move)
+            untried = []
+            if result is None:
+                occupied = masks[0] | masks[1]
+                untried = [number for number, bit in enumerate(bits)
+                           if not occupied & bit]
+            child = MCTSNode(node, move, player, untried, result)
+            node.children.append(child)
+            node = child
+
+        # Playout, scores are for the AI (player 0)
+        if node.result is not None:
+            score = node.result if node.player == 0 else 1 - node.result
+        else:
+            score = self.playout(geometry, masks, node.player, node.untried)
 
-    def minimax(self, board, maximizing, alpha, beta):
+        # Backpropagation
+        while node is not None:
+            node.visits += 1
+            node.score += score if node.player == 0 else 1 - score
+            node = node.parent
+
+    def move_result(self, geometry, masks, player, move):
         """
-        Applying minimax (with alpha-beta pruning) on the game.
-        This implementation does not have a max depth, so it will
-        become very slow when expanding the board size.
+        Returns 1 if the move won the game, 0.5 if it filled the board
+        and None if the game goes on.
+
+        """
+        mask = masks[player]
+        for win_mask in geometry.square_lines[move]:
+            if mask & win_mask == win_mask:
+                return 1
+        if masks[0] | masks[1] == geometry.full:
+            return 0.5
+        return None
+
+    def playout(self, geometry, masks, player, open_squares):
+        """
+        Plays random moves until the game has ended.
 
         Parameters
         ----------
-        board : Board
-            The playing board.
-        maximizing : bool
-            Whether it is the maximizing or minimizing player's turn.
-        alpha : int
-            Aplha-value.
-        beta : int
-            Beta-value.
+        geometry : Geometry
+            The geometry of the board.
+        masks : list
+            Bitmasks of the AI and its opponent.
+        player : int
+            Who made the last move.
+        open_squares : list
+            Square numbers of the open squares.
 
         Returns
         -------
-        int
-            Value of the move.
-        (int, int)
-            Move corresponding the the square on the board.
+        float
+            1 if the AI won, 0 if it lost and 0.5 for a draw.
 
         """
-        if board.is_winner(self):
-            return 1, None
-        elif board.is_winner(self.other_player):
-            return -1, None
-        elif board.is_full():
-            return 0, None
-
-        if maximizing:  # Maximizing player
-            value = float('-inf')
-            move = None
-            for row in range(BOARD_SIZE):
-                for column in range(BOARD_SIZE):
-                    square = row, column
-                    if board.move_is_valid(square):
-                        new_board = board.get_board_copy()
-                        new_board.play_board(square, self)
-                        new_value, new_move = self.minimax(
-                            new_board, not maximizing, alpha, beta)
-                        alpha = max(new_value, alpha)
-                        if new_value > value:
-                            value = new_value
-                            move = square
-                        # Alpha-Beta pruning step
-                        if alpha >= beta:
-                            return value, move
-            return value, move
-
-        else:  # Minimizing player
-            value = float('inf')
-            move = None
-            for row in range(BOARD_SIZE):
-                for column in range(BOARD_SIZE):
-                    square = row, column
-                    if board.move_is_valid(square):
-                        new_board = board.get_board_copy()
-                        new_board.play_board(square, self.other_player)
-                        new_value, new_move = self.minimax(
-                            new_board, not maximizing, alpha, beta)
-                        beta = min(new_value, beta)
-                        if new_value < value:
-                            value = new_value
-                            move = square
-                        # Alpha-Beta pruning step
-                        if alpha >= beta:
-                            return value, move
-
-            return value, move
+        squares = open_squares.copy()
+        self.rng.shuffle(squares)
+        bits = geometry.bits
+        square_lines = geometry.square_lines
+        for move in squares:
+            player = 1 - player
+            mask = masks[player] | bits[move]
+            masks[player] = mask
+            for win_mask in square_lines[move]:
+                if mask & win_mask == win_mask:
+                    return 1 - player
+        return 0.5
 
     def play(self, board):
         """
@@ -183,60 +1635,177 @@ class MiniMaxPlayer(PlayerInterface):
             Column of the next move's square.
 
         """
-        sleep(1.5)
-        return self.minimax(board, True, float('-inf'), float('inf'))[1]
+        sleep(self.delay)
+        board = get_bit_board(board)
+        geometry = board.geometry
+        mine = board.get_mask(self)
+        theirs = board.get_mask(self.other_player)
+        root = self.get_root(board, mine, theirs)
+
+        deadline = None
+        if self.time_limit is not None:
+            deadline = perf_counter() + self.time_limit
+        iteration = 0
+        while self.iterations is None or iteration < self.iterations:
+            self.iterate(root, geometry, mine, theirs)
+            iteration += 1
+            if (deadline is not None and not iteration & 63
+                    and perf_counter() > deadline):
+                break
+
+        # The most visited move is the most reliable one
+        best = max(root.children, key=lambda child: child.visits)
+        best.parent = None
+        self.root = best
+        self.root_masks = geometry, mine | geometry.bits[best.move], theirs
+        return geometry.squares[best.move]
 
 
 class Board:
     """
-    Class representing a the playing board
+    Class representing a the playing board.
+    Every square is stored as one byte: 0 for an open square and
+    1 or 2 for the player in that slot of the attribute players.
+    Players are only looked up at the interface of the class.
 
     Attributes:
-        board (2d list):
-            Matrix of size BOARD_SIZE x BOARD_SIZE representing the playing board.
+        geometry (Geometry):
+            Precomputed bitmasks for the size of the board and the line length.
+        cells (bytearray):
+            Value of every square, by square number.
+        players (list):
+            The players on the board, by cell value, with None at index 0.
+        history (list):
+            Stack of the played moves as (square, player, previous winner).
+        empty_count (int):
+            Amount of squares which have not been played yet.
+        winner (PlayerInterface):
+            Player who has won the game, None if nobody has won yet.
     """
 
-    def __init__(self, board=None):
+    __slots__ = ('geometry', 'cells', 'players', 'history', 'empty_count',
+                 'winner')
+
+    def __init__(self, board=None, size=BOARD_SIZE, n=GAME_N):
         """
         Initialising board, creates an board full of zeroes.
         Unless a board is given as parameter,
-        then that board is passed to the attribute.
+        then the players on that board are copied into the cells.
 
         Parameters
         ----------
         board : 2d list, optional
-            Matrix of size BOARD_SIZE x BOARD_SIZE representing the playing board.
-            The default is None.
+            Matrix of size x size representing the playing board,
+            which overrides size. The default is None.
+        size : int, optional
+            Size of one side of the board. The default is BOARD_SIZE.
+        n : int, optional
+            Amount of squares in a line needed to win. The default is GAME_N.
         """
-        if board is None:
-            self.reset_board()
-        else:
-            self.board = board
+        if board is not None:
+            size = len(board)
+        self.geometry = get_geometry(size, n)
+        self.reset_board()
+        if board is not None:
+            for number, square in enumerate(self.geometry.squares):
+                if isinstance(board[square], PlayerInterface):
+                    self.cells[number] = self.add_player(board[square])
+                    self.empty_count -= 1
 
     def reset_board(self):
-        """
-        Creates an list from 1 to BOARD_SIZE and assigns it to the attribute board.
-        The list is 2d with each list having a length of BOARD_SIZE.
+        """Removes all players from the board."""
+        self.cells = bytearray(len(self.geometry.squares))
+        self.players = [None, None, None]
+        self.history = []
+        self.empty_count = len(self.geometry.squares)
+        self.winner = None
 
+    def get_board(self):
         """
-        number = 1
-        next_board = []
-        for i in range(BOARD_SIZE):
-            arr = []
-            for j in range(BOARD_SIZE):
-                arr.append(number)
-                number += 1
-            next_board.append(arr)
+        Builds the matrix representation of the board.
 
-        self.board = np.array(next_board, dtype=object)
+        Returns
+        -------
+        np.ndarray
+            Matrix of size x size with the number of
+            every open square and the player of every occupied square.
 
-    def get_board(self):
-        """Getter of the attribute board."""
-        return self.board
+        """
+        size = self.geometry.size
+        board = np.arange(1, size ** 2 + 1, dtype=object)
+        for number, cell in enumerate(self.cells):
+            if cell:
+                board[number] = self.players[cell]
+        return board.reshape(size, size)
 
     def get_board_copy(self):
-        """"Returns a copy of the attribute board."""
-        return Board(board=self.board.copy())
+        """"Returns a copy of the board."""
+        board = Board.__new__(Board)
+        board.geometry = self.geometry
+        board.cells = self.cells.copy()
+        board.players = self.players.copy()
+        board.history = self.history.copy()
+        board.empty_count = self.empty_count
+        board.winner = self.winner
+        return board
+
+    def get_player(self, selected_square):
+        """"Returns the player on a square, None if it is open."""
+        row, column = selected_square
+        return self.players[self.cells[row * self.geometry.size + column]]
+
+    def get_slot(self, player):
+        """
+        Returns the cell value of a player, 0 if it is not on the board.
+        Players are looked up by identity, only another object
+        is compared with the players on the board.
+
+        """
+        players = self.players
+        if players[1] is player:
+            return 1
+        elif players[2] is player:
+            return 2
+        for slot in (1, 2):
+            if players[slot] is not None and players[slot] == player:
+                return slot
+        return 0
+
+    def add_player(self, player):
+        """
+        Returns the cell value of a player,
+        which gets a free one if it is not on the board yet.
+
+        Raises
+        ------
+        ValueError
+            If two other players are already on the board.
+
+        """
+        slot = self.get_slot(player)
+        if not slot:
+            if self.players[1] is None:
+                slot = 1
+            elif self.players[2] is None:
+                slot = 2
+            else:
+                raise ValueError('There is only room for two players on a board.')
+            self.players[slot] = player
+        return slot
+
+    def get_winner(self):
+        """Getter of the attribute winner."""
+        return self.winner
+
+    def get_last_move(self):
+        """
+        Returns the square which has been played last,
+        None if no move has been played yet.
+
+        """
+        if self.history:
+            return self.history[-1][0]
+        return None
 
     def is_winner(self, player):
         """
@@ -271,9 +1840,16 @@ class Board:
             Player has won by placing sqaures horizontally or vertically.
 
         """
+        slot = self.get_slot(player)
+        if not slot:
+            return False
+        size = self.geometry.size
+        cells = self.cells
+
         # Checking for each row and column
-        for row, column in zip(self.board, self.board.transpose()):
-            if self.has_winner(row, player) or self.has_winner(column, player):
+        for i in range(size):
+            if (self.has_winner(cells[i * size:(i + 1) * size], slot)
+                    or self.has_winner(cells[i::size], slot)):
                 return True
         return False
 
@@ -293,25 +1869,97 @@ class Board:
             Player has won by placing sqaures diagonally.
 
         """
+        slot = self.get_slot(player)
+        if not slot:
+            return False
+        size, n = self.geometry.size, self.geometry.n
+        cells = self.cells
+
         # Top left to bottom right
-        for row in range(BOARD_SIZE - GAME_N + 1):
-            for column in range(BOARD_SIZE - GAME_N + 1):
-                array = []
-                for i in range(GAME_N):
-                    array.append(self.board[row + i, column + i])
-                if self.has_winner(array, player):
+        for row in range(size - n + 1):
+            for column in range(size - n + 1):
+                start = row * size + column
+                if self.has_winner(
+                        cells[start:start + (n - 1) * (size + 1) + 1:size + 1],
+                        slot):
                     return True
 
         # Top right to bottom left
-        for row in range(BOARD_SIZE - GAME_N + 1):
-            for column in range(GAME_N - 1, BOARD_SIZE):
-                array = []
-                for i in range(GAME_N):
-                    array.append(self.board[row + i, column - i])
-                if self.has_winner(array, player):
+        for row in range(size - n + 1):
+            for column in range(n - 1, size):
+                start = row * size + column
+                if self.has_winner(
+                        cells[start:start + (n - 1) * (size - 1) + 1:size - 1],
+                        slot):
                     return True
         return False
 
+    def is_winning_move(self, selected_square, player):
+        """
+        Checks whether the move on selected_square has won the game.
+        Only the lines through that square are checked, by counting
+        the player's squares outwards from it in all four directions,
+        at most n - 1 squares to either side.
+
+        Parameters
+        ----------
+        selected_square : (int, int)
+            Coordinates of the square which has been played.
+        player : PlayerInterface
+            The player who played the square.
+
+        Returns
+        -------
+        bool
+            Player has n squares in a line through selected_square.
+
+        """
+        slot = self.get_slot(player)
+        if not slot:
+            return False
+        size = self.geometry.size
+        cells = self.cells
+        row, column = selected_square
+        n = self.geometry.n
+        for d_row, d_column in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            counter = 1
+            for sign in (1, -1):
+                r, c = row + sign * d_row, column + sign * d_column
+                for _ in range(n - 1):
+                    if not (0 <= r < size and 0 <= c < size
+                            and cells[r * size + c] == slot):
+                        break
+                    counter += 1
+                    r, c = r + sign * d_row, c + sign * d_column
+            if counter >= n:
+                return True
+        return False
+
+    def get_winning_line(self, player):
+        """
+        Finds a line of n squares of a player, for showing how they won.
+
+        Parameters
+        ----------
+        player : PlayerInterface
+            The player for who to check.
+
+        Returns
+        -------
+        list or None
+            The squares of the line in row-major order,
+            None if the player does not have a line.
+
+        """
+        geometry = self.geometry
+        for win_mask in geometry.win_masks:
+            squares = [square for square, bit in zip(geometry.squares,
+                                                     geometry.bits)
+                       if win_mask & bit]
+            if all(self.get_player(square) == player for square in squares):
+                return squares
+        return None
+
     def has_winner(self, array, player):
         """
         Counts the amount of consecutive squares a player
@@ -320,23 +1968,24 @@ class Board:
         Parameters
         ----------
         array : list
-            1-D list consisting of zeroes and PlayerInterfaces.
-        player : PlayerInterface
-            The player for who to check.
+            1-D list of squares, either from get_board or of cell values.
+        player : PlayerInterface or int
+            The player for who to check, or its cell value.
 
         Returns
         -------
         bool
-            Player has a GAME_N amount of consecutive squares.
+            Player has an n amount of consecutive squares.
 
         """
+        n = self.geometry.n
         counter = 0
         for element in array:
             if element == player:
                 counter += 1
             else:
                 counter = 0
-            if counter == GAME_N:
+            if counter == n:
                 return True
         return False
 
@@ -344,6 +1993,21 @@ class Board:
         """
         Adds a player to a specified square on the board.
 
+        Parameters
+        ----------
+        selected_square : (int, int)
+            Coordinates of a square on the board.
+        player : PlayerInterface
+            Player which has to be placed on the board.
+        """
+        self.make_move(selected_square, player)
+
+    def make_move(self, selected_square, player):
+        """
+        Plays a move in place and updates the last move,
+        the amount of empty squares and the winner.
+        The move can be taken back with undo_move.
+
         Parameters
         ----------
         selected_square : (int, int)
@@ -352,7 +2016,17 @@ class Board:
             Player which has to be placed on the board.
         """
         row, column = selected_square
-        self.board[row, column] = player
+        self.cells[row * self.geometry.size + column] = self.add_player(player)
+        self.history.append((selected_square, player, self.winner))
+        self.empty_count -= 1
+        if self.winner is None and self.is_winning_move(selected_square, player):
+            self.winner = player
+
+    def undo_move(self):
+        """Takes back the last move played with make_move."""
+        (row, column), player, self.winner = self.history.pop()
+        self.cells[row * self.geometry.size + column] = 0
+        self.empty_count += 1
 
     def move_is_valid(self, selected_square):
         """
@@ -370,7 +2044,7 @@ class Board:
 
         """
         row, column = selected_square
-        return isinstance(self.board[row, column], int)
+        return not self.cells[row * self.geometry.size + column]
 
     def is_full(self):
         """
@@ -382,11 +2056,7 @@ class Board:
             Whether every square on the board is occupies.
 
         """
-        for row in self.board:
-            for column in row:
-                if isinstance(column, int):
-                    return False
-        return True
+        return self.empty_count == 0
 
     def get_open_squares(self):
         """
@@ -398,23 +2068,21 @@ class Board:
             List of squares that have not yet been played.
 
         """
-        squares = []
-        for row in range(BOARD_SIZE):
-            for column in range(BOARD_SIZE):
-                if not isinstance(self.board[row, column], PlayerInterface):
-                    squares.append((row, column))
-        return squares
+        squares = self.geometry.squares
+        return [squares[number] for number, cell in enumerate(self.cells)
+                if not cell]
 
     def __str__(self):
         """"Dunder method str of Board class."""
         t = '═══'
         l = '║'
+        size = self.geometry.size
         string = ''
         # Top row
-        string += '╔' + (t + '╦') * (BOARD_SIZE - 1) + t + '╗\n'
+        string += '╔' + (t + '╦') * (size - 1) + t + '╗\n'
 
         # Body of the board
-        for i, row in enumerate(self.board):
+        for i, row in enumerate(self.get_board()):
             for column in row:
                 nr_digits = len(str(column))
                 if isinstance(column, int):
@@ -429,13 +2097,357 @@ class Board:
                 else:
                     string += l + ' {} '.format(column)
             string += l + '\n'
-            if i < BOARD_SIZE - 1:
-                string += '╠' + (t + '╬') * (BOARD_SIZE - 1) + t + '╣\n'
+            if i < size - 1:
+                string += '╠' + (t + '╬') * (size - 1) + t + '╣\n'
         # Bottom Row
-        string += '╚' + (t + '╩') * (BOARD_SIZE - 1) + t + '╝'
+        string += '╚' + (t + '╩') * (size - 1) + t + '╝'
         return string
 
 
+class BitBoard(Board):
+    """
+    Playing board which stores every player's squares as an integer bitmask.
+    It has the same interface as Board, but checking for a winner,
+    a full board or an open square only takes a few bitwise operations.
+
+    Attributes:
+        geometry (Geometry):
+            Precomputed bitmasks for the size of the board and the line length.
+        masks (list):
+            Bitmask of the occupied squares of every player, by cell value,
+            with an empty mask at index 0.
+        players (list):
+            The players on the board, by cell value, with None at index 0.
+        occupied (int):
+            Bitmask of all occupied squares.
+        hashes (list):
+            Zobrist hash of the position under each of the 8 symmetries,
+            the first one being the hash of the position itself.
+        history (list):
+            Stack of the played moves as (square, player, previous winner).
+        empty_count (int):
+            Amount of squares which have not been played yet.
+        winner (PlayerInterface):
+            Player who has won the game, None if nobody has won yet.
+    """
+
+    __slots__ = ('masks', 'occupied', 'hashes')
+
+    def __init__(self, board=None, size=BOARD_SIZE, n=GAME_N):
+        """
+        Initialising an empty board.
+        Unless a board is given as parameter,
+        then the players on that board are copied into the bitmasks.
+
+        Parameters
+        ----------
+        board : 2d list, optional
+            Matrix of size x size representing the playing board,
+            which overrides size. The default is None.
+        size : int, optional
+            Size of one side of the board. The default is BOARD_SIZE.
+        n : int, optional
+            Amount of squares in a line needed to win. The default is GAME_N.
+        """
+        if board is not None:
+            size = len(board)
+        self.geometry = get_geometry(size, n)
+        self.reset_board()
+        if board is not None:
+            for square in self.geometry.squares:
+                if isinstance(board[square], PlayerInterface):
+                    self.play_board(square, board[square])
+
+    def reset_board(self):
+        """Removes all players from the board."""
+        self.masks = [0, 0, 0]
+        self.players = [None, None, None]
+        self.occupied = 0
+        self.hashes = [0] * 8
+        self.history = []
+        self.empty_count = len(self.geometry.squares)
+        self.winner = None
+
+    def get_board(self):
+        """
+        Builds the matrix representation of the board.
+
+        Returns
+        -------
+        np.ndarray
+            Matrix of size x size with the number of
+            every open square and the player of every occupied square.
+
+        """
+        size = self.geometry.size
+        board = np.arange(1, size ** 2 + 1, dtype=object)
+        for slot in (1, 2):
+            mask = self.masks[slot]
+            for i, bit in enumerate(self.geometry.bits):
+                if mask & bit:
+                    board[i] = self.players[slot]
+        return board.reshape(size, size)
+
+    def get_board_copy(self):
+        """"Returns a copy of the board."""
+        board = BitBoard.__new__(BitBoard)
+        board.geometry = self.geometry
+        board.masks = self.masks.copy()
+        board.players = self.players.copy()
+        board.occupied = self.occupied
+        board.hashes = self.hashes.copy()
+        board.history = self.history.copy()
+        board.empty_count = self.empty_count
+        board.winner = self.winner
+        return board
+
+    def get_player(self, selected_square):
+        """"Returns the player on a square, None if it is open."""
+        bit = self.geometry.bits[self.geometry.square_number(selected_square)]
+        for slot in (1, 2):
+            if self.masks[slot] & bit:
+                return self.players[slot]
+        return None
+
+    def get_mask(self, player):
+        """"Returns the bitmask of the squares occupied by player."""
+        players = self.players
+        if players[1] is player:
+            slot = 1
+        elif players[2] is player:
+            slot = 2
+        else:
+            slot = self.get_slot(player)
+        return self.masks[slot]
+
+    def canonical_hash(self):
+        """
+        Returns the canonical key of the position: the smallest of the
+        Zobrist hashes of its 8 symmetric forms, so all symmetric copies of
+        a position share one key. The search and its transposition table
+        look positions up by this key. The tablebase numbers positions with
+        Geometry.position_index instead, as its file has an entry per number.
+
+        Returns
+        -------
+        int
+            Hash of the canonical form.
+        int
+            Index of the transform which maps the position to that form.
+
+        """
+        hashes = self.hashes
+        key = min(hashes)
+        return key, hashes.index(key)
+
+    def get_symmetries(self):
+        """
+        Returns the transforms (other than the identity)
+        which map the position onto itself.
+
+        """
+        hashes = self.hashes
+        return [transform for transform in range(1, 8)
+                if hashes[transform] == hashes[0]]
+
+    def is_winner(self, player):
+        """
+        Checks whether a players has won the game.
+
+        Parameters
+        ----------
+        player : PlayerInterface
+            The player for who to check.
+
+        Returns
+        -------
+        bool
+            Player has won.
+
+        """
+        mask = self.get_mask(player)
+        for win_mask in self.geometry.win_masks:
+            if mask & win_mask == win_mask:
+                return True
+        return False
+
+    def is_winning_move(self, selected_square, player):
+        """
+        Checks whether the move on selected_square has won the game.
+        Only the precomputed lines through that square are checked.
+
+        Parameters
+        ----------
+        selected_square : (int, int)
+            Coordinates of the square which has been played.
+        player : PlayerInterface
+            The player who played the square.
+
+        Returns
+        -------
+        bool
+            Player has n squares in a line through selected_square.
+
+        """
+        number = self.geometry.square_number(selected_square)
+        mask = self.get_mask(player)
+        for win_mask in self.geometry.square_lines[number]:
+            if mask & win_mask == win_mask:
+                return True
+        return False
+
+    def play_board(self, selected_square, player):
+        """
+        Adds a player to a specified square on the board.
+
+        Parameters
+        ----------
+        selected_square : (int, int)
+            Coordinates of a square on the board.
+        player : PlayerInterface
+            Player which has to be placed on the board.
+        """
+        self.make_move(selected_square, player)
+
+    def make_move(self, selected_square, player):
+        """
+        Plays a move in place and updates the last move,
+        the amount of empty squares and the winner.
+        The move can be taken back with undo_move.
+
+        Parameters
+        ----------
+        selected_square : (int, int)
+            Coordinates of a square on the board.
+        player : PlayerInterface
+            Player which has to be placed on the board.
+        """
+        number = self.geometry.square_number(selected_square)
+        bit = self.geometry.bits[number]
+        players = self.players
+        if players[1] is player:
+            slot = 1
+        elif players[2] is player:
+            slot = 2
+        else:
+            slot = self.add_player(player)
+        self.masks[slot] |= bit
+        self.occupied |= bit
+        keys = self.geometry.get_zobrist_keys(player.get_symbol())[number]
+        hashes = self.hashes
+        for transform in range(8):
+            hashes[transform] ^= keys[transform]
+        self.history.append((selected_square, player, self.winner))
+        self.empty_count -= 1
+        if self.winner is None:
+            mask = self.masks[slot]
+            for win_mask in self.geometry.square_lines[number]:
+                if mask & win_mask == win_mask:
+                    self.winner = player
+                    break
+
+    def undo_move(self):
+        """Takes back the last move played with make_move."""
+        selected_square, player, self.winner = self.history.pop()
+        number = self.geometry.square_number(selected_square)
+        bit = self.geometry.bits[number]
+        players = self.players
+        if players[1] is player:
+            slot = 1
+        elif players[2] is player:
+            slot = 2
+        else:
+            slot = self.get_slot(player)
+        self.masks[slot] ^= bit
+        self.occupied ^= bit
+        keys = self.geometry.get_zobrist_keys(player.get_symbol())[number]
+        hashes = self.hashes
+        for transform in range(8):
+            hashes[transform] ^= keys[transform]
+        self.empty_count += 1
+
+    def move_is_valid(self, selected_square):
+        """
+        Checks whether a move has already been played.
+
+        Parameters
+        ----------
+        selected_square : (int, int)
+            Coordinates of a square on the board.
+
+        Returns
+        -------
+        bool
+            Whether the square is still unoccupied.
+
+        """
+        bit = self.geometry.bits[self.geometry.square_number(selected_square)]
+        return not self.occupied & bit
+
+    def is_full(self):
+        """
+        Checks if all squares on the board are occupied.
+
+        Returns
+        -------
+        bool
+            Whether every square on the board is occupies.
+
+        """
+        return self.empty_count == 0
+
+    def get_open_squares(self, centre_first=False):
+        """
+        Checks which squares of the board are still open.
+
+        Parameters
+        ----------
+        centre_first : bool, optional
+            Order the squares from the centre outwards instead of
+            row by row. The default is False.
+
+        Returns
+        -------
+        squares : list
+            List of squares that have not yet been played.
+
+        """
+        occupied = self.occupied
+        if centre_first:
+            return [square for square, bit in self.geometry.centre_order
+                    if not occupied & bit]
+        return [square for square, bit in zip(self.geometry.squares,
+                                              self.geometry.bits)
+                if not occupied & bit]
+
+
+def get_bit_board(board):
+    """
+    Returns a board as a BitBoard, which the searches of the AI players use.
+    A BitBoard is returned as it is, any other board is copied square by
+    square, so the history of the copy holds every player on the board.
+
+    Parameters
+    ----------
+    board : Board
+        The playing board.
+
+    Returns
+    -------
+    BitBoard
+        The board with the same players on the same squares.
+
+    """
+    if isinstance(board, BitBoard):
+        return board
+    bit_board = BitBoard(size=board.geometry.size, n=board.geometry.n)
+    for square in board.geometry.squares:
+        player = board.get_player(square)
+        if player is not None:
+            bit_board.make_move(square, player)
+    return bit_board
+
+
 class Game:
     """"
     Class containing the game logic
@@ -449,12 +2461,22 @@ class Game:
             The playing board.
     """
 
-    def __init__(self):
-        """Initializes the players and board. Initilizes one human and one AI player."""
+    def __init__(self, size=BOARD_SIZE, n=GAME_N):
+        """
+        Initializes the players and board. Initilizes one human and one AI player.
+
+        Parameters
+        ----------
+        size : int, optional
+            Size of one side of the board. The default is BOARD_SIZE.
+        n : int, optional
+            Amount of squares in a line needed to win. The default is GAME_N.
+        """
         self.player1 = HumanPlayer(u'\u00D7')
-        self.player2 = MiniMaxPlayer(u'\u25CB')
+        self.player2 = MiniMaxPlayer(u'\u25CB', time_limit=TIME_LIMIT,
+                                     delay=1.5)
         self.player2.set_other_player(self.player1)
-        self.board = Board()
+        self.board = BitBoard(size=size, n=n)
 
     def play_game(self):
         """The turn-based game logic is defined in this function."""
@@ -476,7 +2498,7 @@ class Game:
             # Player making their turn
             turn = self.get_turn(player_turn)
             self.board.play_board(turn, player_turn)
-            if self.board.is_winner(player_turn):
+            if self.board.get_winner() is not None:
                 break
             elif player_turn == self.player1:
                 player_turn = self.player2
@@ -486,7 +2508,7 @@ class Game:
         # Printing final messages
         print('>' * 10 + '<' * 10)
         print(self.board)
-        if self.board.is_full():
+        if self.board.get_winner() is None:
             print('It\'s a draw!!!')
         else:
             print(f'Congratulations {player_turn.get_name()}, you have won!')
@@ -509,11 +2531,12 @@ class Game:
             Column of the next move's square.
 
         """
+        size = self.board.geometry.size
         try:
             turn = player.play(self.board)
             row, column = turn
-            assert 0 <= row < BOARD_SIZE
-            assert 0 <= column < BOARD_SIZE
+            assert 0 <= row < size
+            assert 0 <= column < size
             assert self.board.move_is_valid(turn)
             return row, column
         except ValueError:
@@ -521,7 +2544,7 @@ class Game:
             return self.get_turn(player)
         except AssertionError:
             print(
-                f'Please enter a number between 0 and {BOARD_SIZE ** 2 + 1}.')
+                f'Please enter a number between 0 and {size ** 2 + 1}.')
             print('If a square is already taken, you cannot play it again.')
             return self.get_turn(player)
 
@@ -0,0 +1,232 @@
+"""
+Load test of the Tic-Tac-No server: many clients which each play
+many games at the same time, with random moves for the human.
+Prints the throughput, the latency of the moves and the results.
+Start the server first, for example with python server.py.
+
+Usage: python loadtest.py [--games GAMES] [--connections CONNECTIONS]
+                          [--size SIZE] [--n N] [--ai AI]
+                          [--host HOST] [--port PORT] [--seed SEED]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import game
+import server
+from time import perf_counter
+
+
+class Client:
+    """
+    Connection to the server, which matches every response to its request.
+
+    Attributes:
+        reader (asyncio.StreamReader):
+            Stream of the responses.
+        writer (asyncio.StreamWriter):
+            Stream of the requests.
+        waiting (dict):
+            Future of every request without a response, by request id.
+        next_id (int):
+            Id of the next request.
+        receiver (asyncio.Task):
+            Task which reads the responses.
+    """
+
+    def __init__(self, reader, writer):
+        """"Constructor."""
+        self.reader = reader
+        self.writer = writer
+        self.waiting = {}
+        self.next_id = 0
+        self.receiver = asyncio.create_task(self.receive())
+
+    async def receive(self):
+        """Hands every response to the request it belongs to."""
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            self.waiting.pop(response['id']).set_result(response)
+        for future in self.waiting.values():
+            future.set_exception(ConnectionError('The server closed the connection.'))
+
+    async def request(self, **request):
+        """
+        Sends a request and waits for its response.
+
+        Raises
+        ------
+        RuntimeError
+            If the server returned an error.
+
+        Returns
+        -------
+        response : dict
+            The response.
+
+        """
+        request['id'] = self.next_id
+        self.next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[request['id']] = future
+        self.writer.write(json.dumps(request).encode() + b'\n')
+        await self.writer.drain()
+        response = await future
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response
+
+    async def close(self):
+        """Closes the connection."""
+        self.writer.close()
+        await self.writer.wait_closed()
+        self.receiver.cancel()
+
+
+async def play_game(client, size, n, ai, rng, latencies):
+    """
+    Plays one game against the server with random moves.
+
+    Parameters
+    ----------
+    client : Client
+        Connection to the server.
+    size : int
+        Size of one side of the board.
+    n : int
+        Amount of squares in a line needed to win.
+    ai : str
+        Player type of the AI.
+    rng : random.Random
+        Random generator of the moves and the starting player.
+    latencies : list
+        Seconds every request took, appended to.
+
+    Returns
+    -------
+    str
+        The result: 'human', 'ai' or 'draw'.
+
+    """
+    board = game.BitBoard(size=size, n=n)
+    first = rng.choice(('human', 'ai'))
+    start = perf_counter()
+    response = await client.request(cmd='new', size=size, n=n, ai=ai,
+                                    first=first)
+    latencies.append(perf_counter() - start)
+    number = response['game']
+
+    while response['result'] is None:
+        if response['ai_move'] is not None:
+            board.make_move(tuple(response['ai_move']), server.AI)
+        square = rng.choice(board.get_open_squares())
+        board.make_move(square, server.HUMAN)
+        start = perf_counter()
+        response = await client.request(cmd='move', game=number,
+                                        square=square)
+        latencies.append(perf_counter() - start)
+    return response['result']
+
+
+async def run_connection(host, port, games, size, n, ai, seed, latencies):
+    """
+    Plays games at the same time over one connection.
+
+    Returns
+    -------
+    results : list
+        The result of every game.
+
+    """
+    client = Client(*await asyncio.open_connection(host, port))
+    rng = random.Random(seed)
+    try:
+        results = await asyncio.gather(
+            *(play_game(client, size, n, ai, random.Random(rng.getrandbits(32)),
+                        latencies) for _ in range(games)))
+    finally:
+        await client.close()
+    return results
+
+
+async def load_test(host=server.HOST, port=server.PORT, games=1000,
+                    connections=10, size=game.BOARD_SIZE, n=game.GAME_N,
+                    ai='minimax', seed=0):
+    """
+    Plays games over several connections at the same time
+    and prints the statistics.
+
+    Parameters
+    ----------
+    host : str, optional
+        Address of the server. The default is HOST.
+    port : int, optional
+        Port of the server. The default is PORT.
+    games : int, optional
+        Amount of games in total. The default is 1000.
+    connections : int, optional
+        Amount of connections to spread the games over. The default is 10.
+    size : int, optional
+        Size of one side of the board. The default is BOARD_SIZE.
+    n : int, optional
+        Amount of squares in a line needed to win. The default is GAME_N.
+    ai : str, optional
+        Player type of the AI. The default is 'minimax'.
+    seed : int, optional
+        Seed of the moves. The default is 0.
+
+    Returns
+    -------
+    dict
+        Amount of games, requests, seconds, the latency percentiles
+        and the amount of every result.
+
+    """
+    latencies = []
+    start = perf_counter()
+    results = await asyncio.gather(
+        *(run_connection(host, port, games // connections
+                         + (i < games % connections), size, n, ai,
+                         seed * connections + i, latencies)
+          for i in range(connections)))
+    seconds = perf_counter() - start
+
+    results = [result for connection in results for result in connection]
+    latencies.sort()
+    stats = {'games': len(results), 'requests': len(latencies),
+             'seconds': seconds,
+             'p50': latencies[len(latencies) // 2],
+             'p99': latencies[len(latencies) * 99 // 100],
+             'results': {result: results.count(result)
+                         for result in ('human', 'ai', 'draw')}}
+    print(f'{stats["games"]} games, {stats["requests"]} requests '
+          f'in {seconds:.2f} s: {stats["games"] / seconds:,.0f} games/s, '
+          f'{stats["requests"] / seconds:,.0f} requests/s')
+    print(f'latency p50 {stats["p50"] * 1000:.1f} ms, '
+          f'p99 {stats["p99"] * 1000:.1f} ms')
+    print(f'results {stats["results"]}')
+    return stats
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--games', type=int, default=1000,
+                        help='amount of games in total')
+    parser.add_argument('--connections', type=int, default=10,
+                        help='amount of connections to spread the games over')
+    parser.add_argument('--size', type=int, default=game.BOARD_SIZE,
+                        help='size of one side of the board')
+    parser.add_argument('--n', type=int, default=game.GAME_N,
+                        help='amount of squares in a line needed to win')
+    parser.add_argument('--ai', default='minimax', help='player type of the AI')
+    parser.add_argument('--host', default=server.HOST, help='address of the server')
+    parser.add_argument('--port', type=int, default=server.PORT,
+                        help='port of the server')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the moves')
+    args = parser.parse_args()
+    asyncio.run(load_test(args.host, args.port, args.games, args.connections,
+                          args.size, args.n, args.ai, args.seed))
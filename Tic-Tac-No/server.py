@@ -0,0 +1,432 @@
+"""
+Server which hosts many games of Tic-Tac-No at once, over TCP.
+Clients send one JSON object per line and get one JSON object per line back.
+Every request may carry an "id", which is copied into its response,
+as responses on one connection can come back in another order.
+
+Requests:
+    {"cmd": "new", "size": 3, "n": 3, "ai": "minimax", "first": "human"}
+        Starts a game, the AI plays "O" and moves at once if it starts.
+    {"cmd": "move", "game": 1, "square": [0, 0]}
+        Plays the human's move, the response has the AI's answer.
+    {"cmd": "close", "game": 1}
+        Abandons a game.
+    {"cmd": "stats"}
+        Amount of games and connections on the server.
+
+Responses of new and move have the game, the AI's move ("ai_move", null if
+it did not move) and the result: null, "human", "ai" or "draw".
+Finished games are removed. Errors are returned as {"error": message},
+also when the AI could not move, in which case the move is not played.
+
+The AI players of tournament.PLAYERS search in a pool of worker processes,
+at most TIME_LIMIT seconds per move whatever the size of the board.
+Every connection has at most MAX_PENDING requests in progress: the server
+stops reading from a connection until one of them is answered, and waits
+until a client has read its responses before sending more.
+
+Usage: python server.py [--host HOST] [--port PORT] [--workers WORKERS]
+"""
+
+import argparse
+import asyncio
+import json
+import game
+import tournament
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+HOST = '127.0.0.1'
+PORT = 8765
+MAX_PENDING = 32  # Maximum amount of requests in progress per connection
+TIME_LIMIT = 1  # Seconds an AI player may search one move
+HUMAN = game.PlayerInterface('X')  # The human player of every game
+AI = game.PlayerInterface('O')  # The AI player of every game
+
+
+class GameSession:
+    """
+    A game on the server.
+
+    Attributes:
+        board (game.BitBoard):
+            The playing board.
+        ai (str):
+            Player type of the AI in tournament.PLAYERS.
+        lock (asyncio.Lock):
+            Makes the requests of the game wait for each other.
+    """
+
+    def __init__(self, size, n, ai):
+        """"Constructor."""
+        self.board = game.BitBoard(size=size, n=n)
+        self.ai = ai
+        self.lock = asyncio.Lock()
+
+    def get_result(self):
+        """
+        Returns the result of the game: None if it has not finished,
+        otherwise 'human', 'ai' or 'draw'.
+
+        """
+        winner = self.board.get_winner()
+        if winner is HUMAN:
+            return 'human'
+        elif winner is AI:
+            return 'ai'
+        elif self.board.is_full():
+            return 'draw'
+        return None
+
+
+class Server:
+    """
+    Server holding all games, which lets a process pool search the AI's moves.
+
+    Attributes:
+        pool (ProcessPoolExecutor):
+            The worker processes.
+        workers (int):
+            Amount of worker processes, None for one per CPU.
+        games (dict):
+            The games in progress, by number.
+        next_game (int):
+            Number of the next game.
+        connections (int):
+            Amount of connected clients.
+        max_pending (int):
+            Maximum amount of requests in progress per connection.
+    """
+
+    def __init__(self, workers=None, max_pending=MAX_PENDING):
+        """"Constructor."""
+        self.pool = ProcessPoolExecutor(workers)
+        self.workers = workers
+        self.games = {}
+        self.next_game = 1
+        self.connections = 0
+        self.max_pending = max_pending
+
+    async def handle(self, reader, writer):
+        """
+        Serves one connection, until the client disconnects.
+        Games which the client has not finished are removed.
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+            Stream of the requests.
+        writer : asyncio.StreamWriter
+            Stream of the responses.
+
+        """
+        self.connections += 1
+        owned = set()
+        pending = asyncio.Semaphore(self.max_pending)
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                # Not reading further while too many requests are in progress
+                await pending.acquire()
+                line = await reader.readline()
+                if not line:
+                    pending.release()
+                    break
+                task = asyncio.create_task(
+                    self.respond(line, owned, writer, write_lock, pending))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks, return_exceptions=True)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            for number in owned:
+                self.games.pop(number, None)
+            self.connections -= 1
+            writer.close()
+
+    async def respond(self, line, owned, writer, write_lock, pending):
+        """
+        Answers one request and waits until the client can take more data.
+
+        Parameters
+        ----------
+        line : bytes
+            The request.
+        owned : set
+            Numbers of the games of the connection.
+        writer : asyncio.StreamWriter
+            Stream of the responses.
+        write_lock : asyncio.Lock
+            Makes the responses of the connection wait for each other.
+        pending : asyncio.Semaphore
+            Requests in progress of the connection, released when done.
+
+        """
+        request = {}
+        try:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError('A request has to be a JSON object.')
+                response = await self.dispatch(request, owned)
+            except (ValueError, KeyError, TypeError) as error:
+                response = {'error': str(error)}
+            except Exception as error:
+                # The client waits for an answer to every request
+                response = {'error': f'The server failed: {error!r}'}
+            if isinstance(request, dict) and 'id' in request:
+                response['id'] = request['id']
+
+            async with write_lock:
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        finally:
+            pending.release()
+
+    async def dispatch(self, request, owned):
+        """
+        Carries out a request.
+
+        Parameters
+        ----------
+        request : dict
+            The request.
+        owned : set
+            Numbers of the games of the connection.
+
+        Raises
+        ------
+        ValueError
+            If the request is not valid.
+
+        Returns
+        -------
+        dict
+            The response.
+
+        """
+        command = request.get('cmd')
+        if command == 'new':
+            return await self.new_game(request, owned)
+        elif command == 'move':
+            return await self.move(request, owned)
+        elif command == 'close':
+            number = request['game']
+            if number not in owned:
+                raise ValueError(f'Unknown game {number}.')
+            owned.discard(number)
+            self.games.pop(number, None)
+            return {'game': number}
+        elif command == 'stats':
+            return {'games': len(self.games), 'connections': self.connections}
+        raise ValueError(f'Unknown command {command}.')
+
+    async def new_game(self, request, owned):
+        """
+        Starts a game, in which the AI moves at once if it starts.
+
+        Parameters
+        ----------
+        request : dict
+            The request, with optional size, n, ai and first.
+        owned : set
+            Numbers of the games of the connection.
+
+        Returns
+        -------
+        dict
+            The response.
+
+        """
+        size = int(request.get('size', game.BOARD_SIZE))
+        n = int(request.get('n', game.GAME_N))
+        ai = request.get('ai', 'minimax')
+        if not 1 <= n <= size <= 16:
+            raise ValueError('The size has to be at most 16 and at least n.')
+        if ai not in tournament.PLAYERS:
+            raise ValueError(f'Unknown AI {ai}.')
+
+        number = self.next_game
+        self.next_game += 1
+        session = GameSession(size, n, ai)
+        self.games[number] = session
+        owned.add(number)
+        async with session.lock:
+            ai_move = None
+            if request.get('first', 'human') == 'ai':
+                try:
+                    ai_move = await self.play_ai(session)
+                except BaseException:
+                    # The client does not get the number of the game
+                    owned.discard(number)
+                    self.games.pop(number, None)
+                    raise
+            return self.finish(number, session, owned, ai_move)
+
+    async def move(self, request, owned):
+        """
+        Plays the human's move and the AI's answer.
+
+        Parameters
+        ----------
+        request : dict
+            The request, with the game and the square.
+        owned : set
+            Numbers of the games of the connection.
+
+        Returns
+        -------
+        dict
+            The response.
+
+        """
+        number = request['game']
+        if number not in owned or number not in self.games:
+            raise ValueError(f'Unknown game {number}.')
+        session = self.games[number]
+        async with session.lock:
+            row, column = request['square']
+            size = session.board.geometry.size
+            if not (0 <= row < size and 0 <= column < size
+                    and session.board.move_is_valid((row, column))):
+                raise ValueError(f'Square {[row, column]} cannot be played.')
+
+            session.board.make_move((row, column), HUMAN)
+            ai_move = None
+            if session.get_result() is None:
+                try:
+                    ai_move = await self.play_ai(session)
+                except BaseException:
+                    # Otherwise the human would move twice in a row
+                    session.board.undo_move()
+                    raise
+            return self.finish(number, session, owned, ai_move)
+
+    async def play_ai(self, session):
+        """
+        Lets a worker process search the AI's move and plays it.
+        When a worker process has died, the pool is replaced for the
+        requests after this one.
+
+        Raises
+        ------
+        BrokenProcessPool
+            If a worker process died.
+
+        """
+        board = session.board
+        moves = [(square, player.get_symbol())
+                 for square, player, _ in board.history]
+        loop = asyncio.get_running_loop()
+        pool = self.pool
+        try:
+            square = await loop.run_in_executor(
+                pool, search_move, session.ai, board.geometry.size,
+                board.geometry.n, moves)
+        except BrokenProcessPool:
+            if self.pool is pool:
+                self.pool = ProcessPoolExecutor(self.workers)
+                pool.shutdown(wait=False)
+            raise
+        board.make_move(square, AI)
+        return square
+
+    def finish(self, number, session, owned, ai_move):
+        """"Builds the response of a move and removes a finished game."""
+        result = session.get_result()
+        if result is not None:
+            owned.discard(number)
+            self.games.pop(number, None)
+        return {'game': number, 'ai_move': ai_move, 'result': result}
+
+    def close(self):
+        """Shuts down the worker processes."""
+        self.pool.shutdown(cancel_futures=True)
+
+
+_players = {}  # AI players of a worker process, by player type and geometry
+
+
+def search_move(ai, size, n, moves):
+    """
+    Searches the AI's move in a worker process.
+    Every worker keeps one player of every type and geometry,
+    such that transposition tables and search trees are reused.
+    The players search at most TIME_LIMIT seconds, so that a large board
+    does not take up a worker for minutes.
+
+    Parameters
+    ----------
+    ai : str
+        Player type of the AI in tournament.PLAYERS.
+    size : int
+        Size of one side of the board.
+    n : int
+        Amount of squares in a line needed to win.
+    moves : list
+        The moves played so far as (square, symbol).
+
+    Returns
+    -------
+    (int, int)
+        The AI's move.
+
+    """
+    if (ai, size, n) not in _players:
+        player = tournament.create_player(ai, AI.get_symbol(), None)
+        if hasattr(player, 'time_limit'):
+            player.time_limit = TIME_LIMIT
+        human = game.HumanPlayer(HUMAN.get_symbol())
+        if hasattr(player, 'set_other_player'):
+            player.set_other_player(human)
+        _players[ai, size, n] = player, human
+    player, human = _players[ai, size, n]
+
+    board = game.BitBoard(size=size, n=n)
+    for square, symbol in moves:
+        board.make_move(tuple(square),
+                        player if symbol == AI.get_symbol() else human)
+    return player.play(board)
+
+
+async def serve(host=HOST, port=PORT, workers=None, max_pending=MAX_PENDING):
+    """
+    Runs the server until it is interrupted.
+
+    Parameters
+    ----------
+    host : str, optional
+        Address to listen on. The default is HOST.
+    port : int, optional
+        Port to listen on. The default is PORT.
+    workers : int, optional
+        Amount of worker processes. The default is None, one per CPU.
+    max_pending : int, optional
+        Maximum amount of requests in progress per connection.
+        The default is MAX_PENDING.
+
+    """
+    server = Server(workers, max_pending)
+    tcp_server = await asyncio.start_server(server.handle, host, port)
+    print(f'Serving Tic-Tac-No on {host}:{port}')
+    try:
+        async with tcp_server:
+            await tcp_server.serve_forever()
+    finally:
+        server.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--host', default=HOST, help='address to listen on')
+    parser.add_argument('--port', type=int, default=PORT, help='port to listen on')
+    parser.add_argument('--workers', type=int, help='amount of worker processes')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,235 @@
+"""
+Headless simulator which plays many games of Tic-Tac-No at once.
+All boards are stacked in one int8 array (0 for an open square,
+1 and 2 for the first and second player) and every turn is played
+in all unfinished games at the same time, with NumPy.
+
+A player is a function player(boards, player, n, rng) which gets the boards
+of the unfinished games, its own number, GAME_N and a NumPy random generator,
+and returns the (flat) square number of its move in every game.
+
+Usage: python simulator.py [games] [board size] [GAME_N]
+"""
+
+import sys
+import numpy as np
+import game
+from functools import lru_cache
+from numpy.lib.stride_tricks import sliding_window_view
+from time import perf_counter
+
+DRAW = 3  # Result of a game which ended in a draw
+
+
+def random_player(boards, player, n, rng):
+    """
+    Plays a random open square in every game.
+
+    Parameters
+    ----------
+    boards : np.ndarray
+        int8 array of shape (games, size, size).
+    player : int
+        Number of the player to move.
+    n : int
+        Amount of squares in a line needed to win.
+    rng : np.random.Generator
+        Random generator.
+
+    Returns
+    -------
+    np.ndarray
+        Flat square number of the move in every game.
+
+    """
+    open_squares = boards.reshape(len(boards), -1) == 0
+    return np.argmax(rng.random(open_squares.shape) * open_squares, axis=1)
+
+
+def heuristic_player(boards, player, n, rng):
+    """
+    Completes a line if it can, otherwise blocks a line of the opponent,
+    otherwise plays a random open square with a preference for the centre.
+
+    Parameters
+    ----------
+    boards : np.ndarray
+        int8 array of shape (games, size, size).
+    player : int
+        Number of the player to move.
+    n : int
+        Amount of squares in a line needed to win.
+    rng : np.random.Generator
+        Random generator.
+
+    Returns
+    -------
+    np.ndarray
+        Flat square number of the move in every game.
+
+    """
+    size = boards.shape[1]
+    lines = get_line_matrix(size, n)
+    flat = boards.reshape(len(boards), -1)
+    open_squares = flat == 0
+    mine = (flat == player).astype(np.int16) @ lines.T
+    theirs = (flat == 3 - player).astype(np.int16) @ lines.T
+
+    # Squares which finish a line of the player or the opponent
+    win = ((mine == n - 1) & (theirs == 0)).astype(np.int16) @ lines > 0
+    block = ((theirs == n - 1) & (mine == 0)).astype(np.int16) @ lines > 0
+
+    centre = (size - 1) / 2
+    rows, columns = np.divmod(np.arange(size * size), size)
+    closeness = 1 / (1 + np.abs(rows - centre) + np.abs(columns - centre))
+    scores = 4 * win + 2 * block + rng.random(flat.shape) * closeness
+    return np.argmax(np.where(open_squares, scores, -1), axis=1)
+
+
+@lru_cache(maxsize=None)
+def get_line_matrix(size, n):
+    """
+    Returns the (cached) (lines, squares) matrix
+    with a 1 for every square of every line.
+
+    Parameters
+    ----------
+    size : int
+        Size of one side of the board.
+    n : int
+        Amount of squares in a line needed to win.
+
+    Returns
+    -------
+    np.ndarray
+        int16 matrix with a row per line of n squares.
+
+    """
+    geometry = game.get_geometry(size, n)
+    return np.array([[mask >> number & 1 for number in range(size * size)]
+                     for mask in geometry.win_masks], dtype=np.int16)
+
+
+def find_winners(boards, player, n):
+    """
+    Checks in which games a player has n squares in a line,
+    using sliding-window sums over rows, columns and diagonals.
+
+    Parameters
+    ----------
+    boards : np.ndarray
+        int8 array of shape (games, size, size).
+    player : int
+        Number of the player.
+    n : int
+        Amount of squares in a line needed to win.
+
+    Returns
+    -------
+    won : np.ndarray
+        Boolean array, True for the games the player has won.
+
+    """
+    mine = (boards == player).astype(np.int8)
+    span = boards.shape[1] - n + 1
+    rows = sliding_window_view(mine, n, axis=2).sum(axis=3)
+    columns = sliding_window_view(mine, n, axis=1).sum(axis=3)
+    diagonals = sum(mine[:, i:i + span, i:i + span] for i in range(n))
+    anti_diagonals = sum(mine[:, i:i + span, n - 1 - i:n - 1 - i + span]
+                         for i in range(n))
+    won = (rows == n).any(axis=(1, 2)) | (columns == n).any(axis=(1, 2))
+    won |= (diagonals == n).any(axis=(1, 2))
+    won |= (anti_diagonals == n).any(axis=(1, 2))
+    return won
+
+
+def simulate(games, first, second, size=game.BOARD_SIZE, n=game.GAME_N,
+             seed=None):
+    """
+    Plays games between two players, all games in lockstep.
+
+    Parameters
+    ----------
+    games : int
+        Amount of games to play.
+    first : callable
+        The player who starts every game.
+    second : callable
+        The other player.
+    size : int, optional
+        Size of one side of the board. The default is BOARD_SIZE.
+    n : int, optional
+        Amount of squares in a line needed to win. The default is GAME_N.
+    seed : int, optional
+        Seed of the random generator. The default is None.
+
+    Raises
+    ------
+    ValueError
+        If a player plays a square which has already been taken.
+
+    Returns
+    -------
+    results : np.ndarray
+        Result of every game: 1 or 2 for the winner, DRAW for a draw.
+
+    """
+    rng = np.random.default_rng(seed)
+    boards = np.zeros((games, size, size), dtype=np.int8)
+    flat = boards.reshape(games, -1)
+    results = np.zeros(games, dtype=np.int8)
+    active = np.arange(games)
+
+    for turn in range(size * size):
+        if not active.size:
+            break
+        player = 1 + turn % 2
+        moves = (first if player == 1 else second)(boards[active], player,
+                                                   n, rng)
+        if (flat[active, moves] != 0).any():
+            raise ValueError(f'Player {player} played a square which is taken.')
+        flat[active, moves] = player
+
+        won = find_winners(boards[active], player, n)
+        results[active[won]] = player
+        active = active[~won]
+    results[active] = DRAW
+    return results
+
+
+def statistics(results):
+    """
+    Counts the wins of both players and the draws.
+
+    Parameters
+    ----------
+    results : np.ndarray
+        Result of every game, as returned by simulate.
+
+    Returns
+    -------
+    dict
+        Amount of games, wins of the first and second player and draws.
+
+    """
+    return {'games': len(results),
+            'first': int((results == 1).sum()),
+            'second': int((results == 2).sum()),
+            'draws': int((results == DRAW).sum())}
+
+
+if __name__ == '__main__':
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else game.BOARD_SIZE
+    n = int(sys.argv[3]) if len(sys.argv) > 3 else game.GAME_N
+
+    players = {'random': random_player, 'heuristic': heuristic_player}
+    for first_name, first in players.items():
+        for second_name, second in players.items():
+            start = perf_counter()
+            stats = statistics(simulate(games, first, second, size, n, seed=0))
+            seconds = perf_counter() - start
+            print(f'{first_name:>9} vs {second_name:<9} '
+                  f'first: {stats["first"]:>6}  second: {stats["second"]:>6}  '
+                  f'draws: {stats["draws"]:>6}  '
+                  f'({games / seconds:,.0f} games/s)')
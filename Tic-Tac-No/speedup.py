@@ -0,0 +1,86 @@
+"""
+Compares the serial and the parallel search of MiniMaxPlayer
+on a few reference positions and prints the speedup.
+
+Usage: python speedup.py [workers]
+"""
+
+import os
+import sys
+import game
+from time import perf_counter
+
+# Board size, GAME_N, max depth and the moves played before the AI's turn
+POSITIONS = [(3, 3, None, [(0, 0)]),
+             (4, 3, None, [(0, 1)]),
+             (4, 4, 8, [(0, 1)]),
+             (5, 4, 6, [(2, 2), (1, 1), (0, 1)])]
+
+
+def time_search(player, size, n, moves):
+    """
+    Times one search of player on a reference position.
+
+    Parameters
+    ----------
+    player : game.MiniMaxPlayer
+        The AI player, the opponent of the moves played by the human.
+    size : int
+        Size of one side of the board.
+    n : int
+        Amount of squares in a line needed to win.
+    moves : list
+        Squares played alternately by the human and the AI.
+
+    Returns
+    -------
+    (int, int)
+        The move of the AI.
+    float
+        Seconds the search took.
+
+    """
+    board = game.BitBoard(size=size, n=n)
+    for i, square in enumerate(moves):
+        board.make_move(square, player.other_player if i % 2 == 0 else player)
+    start = perf_counter()
+    move = player.play(board)
+    return move, perf_counter() - start
+
+
+def compare(workers):
+    """
+    Prints the time of the serial and the parallel search
+    for every reference position.
+
+    Parameters
+    ----------
+    workers : int
+        Amount of worker processes of the parallel search.
+
+    """
+    human = game.HumanPlayer('X')
+    print(f'{"board":>7} {"depth":>5} {"serial":>8} {"parallel":>8} {"speedup":>7}')
+    for size, n, depth, moves in POSITIONS:
+        serial = game.MiniMaxPlayer('O', max_depth=depth, use_tablebase=False)
+        parallel = game.MiniMaxPlayer('O', max_depth=depth, use_tablebase=False,
+                                      workers=workers)
+        serial.set_other_player(human)
+        parallel.set_other_player(human)
+
+        serial_move, serial_time = time_search(serial, size, n, moves)
+        parallel_move, parallel_time = time_search(parallel, size, n, moves)
+        parallel.close()
+        # Both searches play the move nearest the centre of the equally good moves
+        assert serial_move == parallel_move, 'The searches chose different moves.'
+
+        board = f'{size}x{size}/{n}'
+        print(f'{board:>7} {str(depth):>5} {serial_time:8.3f} '
+              f'{parallel_time:8.3f} {serial_time / parallel_time:7.2f}')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 2:
+        compare(int(sys.argv[1]))
+    else:
+        compare(os.cpu_count())
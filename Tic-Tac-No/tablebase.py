@@ -0,0 +1,107 @@
+"""
+Creates the tablebase of a board geometry: the perfect-play result and
+best move of every position which can be reached from the empty board.
+MiniMaxPlayer looks its moves up in this file instead of searching.
+
+Usage: python tablebase.py [board size] [GAME_N]
+"""
+
+import sys
+import game
+
+
+def solve(geometry, mine, theirs, entries):
+    """
+    Solves a position with negamax, storing every solved position.
+    Of the moves with the best result, the fastest win or slowest loss is kept.
+
+    Parameters
+    ----------
+    geometry : game.Geometry
+        The geometry of the board.
+    mine : int
+        Bitmask of the squares of the player to move.
+    theirs : int
+        Bitmask of the squares of the opponent.
+    entries : dict
+        Solved positions, (result, moves until the end, canonical best move)
+        by position index.
+
+    Returns
+    -------
+    int
+        LOSS, DRAW or WIN for the player to move.
+    int
+        Amount of moves until the end of the game.
+
+    """
+    index, transform = geometry.position_index(mine, theirs)
+    if index in entries:
+        return entries[index][:2]
+
+    occupied = mine | theirs
+    best = None
+    for number, bit in enumerate(geometry.bits):
+        if occupied & bit:
+            continue
+        new = mine | bit
+        if any(new & mask == mask for mask in geometry.square_lines[number]):
+            result, moves = game.WIN, 1
+        elif new | theirs == geometry.full:
+            result, moves = game.DRAW, 1
+        else:
+            result, moves = solve(geometry, theirs, new, entries)
+            result, moves = game.WIN - result, moves + 1
+
+        # Winning fast is better, losing slow is better
+        score = result, moves if result == game.LOSS else -moves
+        if best is None or score > best[0]:
+            best = score, result, moves, number
+
+    _, result, moves, number = best
+    entries[index] = result, moves, geometry.transforms[transform][number]
+    return result, moves
+
+
+def create_tablebase(size, n):
+    """
+    Solves every reachable position of a geometry and writes the tablebase.
+
+    Parameters
+    ----------
+    size : int
+        Size of one side of the board.
+    n : int
+        Amount of squares in a line needed to win.
+
+    Returns
+    -------
+    str
+        Path of the written file.
+
+    """
+    geometry = game.get_geometry(size, n)
+    if len(geometry.squares) > 16:
+        raise ValueError('Moves are stored in 4 bits, '
+                         'so the board can have at most 16 squares.')
+
+    entries = {}
+    solve(geometry, 0, 0, entries)
+
+    data = bytearray(b'\xff' * 3 ** len(geometry.squares))
+    for index, (result, _, number) in entries.items():
+        data[index] = result << 4 | number
+
+    path = game.get_tablebase_path(size, n)
+    with open(path, 'wb') as file:
+        file.write(game.TABLEBASE_MAGIC + bytes((size, n)))
+        file.write(data)
+    print(f'Solved {len(entries)} positions, written to {path}')
+    return path
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        create_tablebase(int(sys.argv[1]), int(sys.argv[2]))
+    else:
+        create_tablebase(game.BOARD_SIZE, game.GAME_N)
@@ -0,0 +1,203 @@
+"""
+Headless round-robin tournament between AI players.
+Every pair of players meets a number of times with both players starting,
+the matches are played in parallel by a process pool and every result is
+written to a JSONL or CSV file as soon as it comes in.
+Every match gets its own seed, derived from the tournament seed,
+so a tournament can be replayed exactly.
+
+Usage: python tournament.py [results file] [games per pairing] [board size] [GAME_N]
+"""
+
+import csv
+import json
+import random
+import sys
+import game
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import permutations
+from time import perf_counter
+
+# Player types of the tournament: class and keyword arguments
+PLAYERS = {'minimax': (game.MiniMaxPlayer, {'max_depth': 6}),
+           'minimax-shallow': (game.MiniMaxPlayer, {'max_depth': 2,
+                                                    'use_tablebase': False}),
+           'mcts': (game.MCTSPlayer, {'iterations': 2000, 'time_limit': None}),
+           'random': (game.RandomPlayer, {})}
+FIELDS = ['match', 'first', 'second', 'winner', 'moves', 'seconds', 'seed']
+
+
+def create_player(name, symbol, seed):
+    """
+    Creates a player of the tournament.
+
+    Parameters
+    ----------
+    name : str
+        Name of the player type in PLAYERS.
+    symbol : str
+        Symbol of the player.
+    seed : int
+        Seed for players which make random choices.
+
+    Returns
+    -------
+    game.PlayerInterface
+        The player.
+
+    """
+    player_class, kwargs = PLAYERS[name]
+    if player_class in (game.MCTSPlayer, game.RandomPlayer):
+        kwargs = dict(kwargs, seed=seed)
+    return player_class(symbol, **kwargs)
+
+
+def play_match(match, first_name, second_name, size, n, seed):
+    """
+    Plays one game without any input, output or delays.
+
+    Parameters
+    ----------
+    match : int
+        Number of the match.
+    first_name : str
+        Player type of the player who starts.
+    second_name : str
+        Player type of the other player.
+    size : int
+        Size of one side of the board.
+    n : int
+        Amount of squares in a line needed to win.
+    seed : int
+        Seed of the match.
+
+    Returns
+    -------
+    dict
+        The result of the match, with the keys in FIELDS.
+        The winner is 'first', 'second' or 'draw'.
+
+    """
+    rng = random.Random(seed)
+    first = create_player(first_name, 'X', rng.getrandbits(32))
+    second = create_player(second_name, 'O', rng.getrandbits(32))
+    for player, other in ((first, second), (second, first)):
+        if hasattr(player, 'set_other_player'):
+            player.set_other_player(other)
+
+    start = perf_counter()
+    board = game.BitBoard(size=size, n=n)
+    player_turn = first
+    while board.get_winner() is None and not board.is_full():
+        board.make_move(player_turn.play(board), player_turn)
+        player_turn = second if player_turn is first else first
+
+    winner = 'draw'
+    if board.get_winner() is first:
+        winner = 'first'
+    elif board.get_winner() is second:
+        winner = 'second'
+    return {'match': match, 'first': first_name, 'second': second_name,
+            'winner': winner, 'moves': len(board.history),
+            'seconds': round(perf_counter() - start, 4), 'seed': seed}
+
+
+def schedule(names, games, seed):
+    """
+    Creates the matches of a round robin with both players starting.
+
+    Parameters
+    ----------
+    names : list
+        Player types taking part.
+    games : int
+        Amount of games per pairing and starting player.
+    seed : int
+        Seed of the tournament.
+
+    Returns
+    -------
+    matches : list
+        (match, first player, second player, seed of the match) of every match.
+
+    """
+    rng = random.Random(seed)
+    matches = []
+    for first, second in permutations(names, 2):
+        for _ in range(games):
+            matches.append((len(matches), first, second, rng.getrandbits(32)))
+    return matches
+
+
+def run_tournament(path, names=tuple(PLAYERS), games=10, size=game.BOARD_SIZE,
+                   n=game.GAME_N, seed=0, workers=None):
+    """
+    Runs a tournament and streams the results to a file.
+
+    Parameters
+    ----------
+    path : str
+        File to write the results to, CSV if it ends with .csv, JSONL otherwise.
+    names : tuple, optional
+        Player types taking part. The default is all of PLAYERS.
+    games : int, optional
+        Amount of games per pairing and starting player. The default is 10.
+    size : int, optional
+        Size of one side of the board. The default is BOARD_SIZE.
+    n : int, optional
+        Amount of squares in a line needed to win. The default is GAME_N.
+    seed : int, optional
+        Seed of the tournament. The default is 0.
+    workers : int, optional
+        Amount of processes. The default is None, one per CPU.
+
+    Returns
+    -------
+    scores : dict
+        [wins, draws, losses] of every player type.
+
+    """
+    scores = {name: [0, 0, 0] for name in names}
+    with open(path, 'w', newline='') as file, \
+            ProcessPoolExecutor(workers) as pool:
+        writer = None
+        if path.endswith('.csv'):
+            writer = csv.DictWriter(file, FIELDS)
+            writer.writeheader()
+
+        futures = [pool.submit(play_match, match, first, second, size, n,
+                               match_seed)
+                   for match, first, second, match_seed
+                   in schedule(names, games, seed)]
+        for future in as_completed(futures):
+            result = future.result()
+            if writer is None:
+                file.write(json.dumps(result) + '\n')
+            else:
+                writer.writerow(result)
+            file.flush()
+
+            first, second = scores[result['first']], scores[result['second']]
+            if result['winner'] == 'first':
+                first[0] += 1
+                second[2] += 1
+            elif result['winner'] == 'second':
+                first[2] += 1
+                second[0] += 1
+            else:
+                first[1] += 1
+                second[1] += 1
+    return scores
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else 'tournament.jsonl'
+    games = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    size = int(sys.argv[3]) if len(sys.argv) > 3 else game.BOARD_SIZE
+    n = int(sys.argv[4]) if len(sys.argv) > 4 else game.GAME_N
+
+    scores = run_tournament(path, games=games, size=size, n=n)
+    print(f'{"player":<16} {"wins":>5} {"draws":>5} {"losses":>6}')
+    for name, (wins, draws, losses) in sorted(scores.items(),
+                                              key=lambda item: -item[1][0]):
+        print(f'{name:<16} {wins:>5} {draws:>5} {losses:>6}')
@@ -1,39 +1,16 @@
-from typing import List, Dict, Tuple, Callable
+import re
+from typing import List, Dict, Tuple, Callable, Optional, Union, NamedTuple
 
+import numpy as np
 
-class Node:
-    def __init__(self, value: int, moves: int, parent: Node=None) -> None:
-        self.children: List[Node] = list()
-        self.value: int = value
-        self.moves: int = moves
-        self.parent: Node = parent
 
+INT64_LIMIT: int = 2**63 - 1
 
-    def get_path(self, path: List[Node]=list()) -> List[Node]:
-        path.append(self)
-        if path[-1].parent is None:
-            return path
-        else:
-            return self.get_path(path)
-        
-
-    def __str__(self) -> str:
-        return str(self.value)
-    
-
-    def create_children(self) -> List[Node]:
-        if moves < 1:
-            return list()
-        
-        children: List[Node] = list()
-
-        for func, num in functions:
-            new_value: int = func(self.value, num)
-            children.append(Node(new_value, self.moves-1, self))
+# The argument of an operation and an operation with its argument, as the buttons of a puzzle
+Argument = Union[int, str, Tuple[str, str], None]
+Function = Tuple[Callable, Argument]
 
-        return children     
 
-    
 def add(a: int, b: int) -> int:
     return a + b
 
@@ -50,30 +27,420 @@ def divide(a: int, b: int) -> int:
     return a // b
 
 
-def create_tree(moves: int, goal: int, start: int, functions: List[Tuple[Callable, int]]) -> List[Node]:
-    root: Node = Node(start, moves)
+# The digit buttons work on the digits of the value and keep its sign
+def with_sign(a: int, value: int) -> int:
+    return value if a >= 0 else -value
 
 
+def append(a: int, b: str) -> int:
+    return with_sign(a, abs(a) * 10**len(b) + int(b)) if a != 0 else int(b)
 
-def ask_functions() -> List[Tuple[Callable, int]]:
-    function_map: Dict[str, Callable] = {'+': add,
-                                            '-': substract,
-                                            '*': multiply,
-                                            '/': divide}
-    
+
+def backspace(a: int, b: None) -> int:
+    return with_sign(a, abs(a) // 10)
+
+
+def flip_sign(a: int, b: None) -> int:
+    return -a
+
+
+def reverse(a: int, b: None) -> int:
+    return with_sign(a, int(str(abs(a))[::-1]))
+
+
+def sum_digits(a: int, b: None) -> int:
+    return with_sign(a, sum(int(digit) for digit in str(abs(a))))
+
+
+def mirror(a: int, b: None) -> int:
+    digits: str = str(abs(a))
+    return with_sign(a, int(digits + digits[::-1]))
+
+
+def replace(a: int, b: Tuple[str, str]) -> int:
+    return with_sign(a, int(str(abs(a)).replace(*b)))
+
+
+# The batch forms apply an operation to a whole int64 array, None if it cannot be applied
+def divide_batch(a: np.ndarray, b: int) -> Optional[np.ndarray]:
+    return a // b if b != 0 else None
+
+
+def with_sign_batch(a: np.ndarray, values: np.ndarray) -> np.ndarray:
+    return np.where(a >= 0, values, -values)
+
+
+# Python ints beyond int64 have too many digits for the digit loops, their strings are quicker
+def scalar_batch(func: Callable, a: np.ndarray, b: Argument) -> np.ndarray:
+    return np.array([func(value, b) for value in a.tolist()], dtype=object)
+
+
+def append_batch(a: np.ndarray, b: str) -> Optional[np.ndarray]:
+    return np.where(a != 0, with_sign_batch(a, np.abs(a) * 10**len(b) + int(b)), int(b))
+
+
+def backspace_batch(a: np.ndarray, b: None) -> Optional[np.ndarray]:
+    return with_sign_batch(a, np.abs(a) // 10)
+
+
+def reverse_batch(a: np.ndarray, b: None) -> Optional[np.ndarray]:
+    if a.dtype == object:
+        return scalar_batch(reverse, a, b)
+    rest: np.ndarray = np.abs(a)
+    reversed_values: np.ndarray = np.zeros_like(a)
+    while rest.any():
+        reversed_values = np.where(rest > 0, reversed_values * 10 + rest % 10, reversed_values)
+        rest = rest // 10
+    return with_sign_batch(a, reversed_values)
+
+
+def sum_digits_batch(a: np.ndarray, b: None) -> Optional[np.ndarray]:
+    if a.dtype == object:
+        return scalar_batch(sum_digits, a, b)
+    rest: np.ndarray = np.abs(a)
+    sums: np.ndarray = np.zeros_like(a)
+    while rest.any():
+        sums += rest % 10
+        rest = rest // 10
+    return with_sign_batch(a, sums)
+
+
+def mirror_batch(a: np.ndarray, b: None) -> Optional[np.ndarray]:
+    if a.dtype == object:
+        return scalar_batch(mirror, a, b)
+    # The value is shifted left by its amount of digits, at least one for 0
+    shifts: np.ndarray = np.full_like(a, 10)
+    rest: np.ndarray = np.abs(a) // 10
+    while rest.any():
+        shifts = np.where(rest > 0, shifts * 10, shifts)
+        rest = rest // 10
+    return with_sign_batch(a, np.abs(a) * shifts + np.abs(reverse_batch(a, None)))
+
+
+def replace_batch(a: np.ndarray, b: Tuple[str, str]) -> Optional[np.ndarray]:
+    if a.dtype == object:
+        return scalar_batch(replace, a, b)
+    digits: np.ndarray = np.char.replace(np.abs(a).astype(str), *b)
+    return with_sign_batch(a, digits.astype(np.int64))
+
+
+# The largest absolute result of an operation or its inverse on values up to a, to know when int64 could overflow
+def arithmetic_bound(a: int, b: int) -> int:
+    return a * max(abs(b), 1) + abs(b)
+
+
+def append_bound(a: int, b: str) -> int:
+    return a * 10**len(b) + int(b)
+
+
+def same_bound(a: int, b: None) -> int:
+    return a
+
+
+def reverse_bound(a: int, b: None) -> int:
+    return 10**len(str(a)) - 1
+
+
+def mirror_bound(a: int, b: None) -> int:
+    return 10**(2 * len(str(a))) - 1
+
+
+def replace_bound(a: int, b: Tuple[str, str]) -> int:
+    digits: int = len(str(a))
+    return 10**(digits + digits // len(b[0]) * max(len(b[1]) - len(b[0]), 0)) - 1
+
+
+def backspace_inverse_bound(a: int, b: None) -> int:
+    return a * 10 + 9
+
+
+# The inverse batch forms give the values from which an operation leads to the values of a, with the
+# index in a of the value each leads to, None if every value leads to one of a
+def add_inverse(a: np.ndarray, b: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    return a - b, np.arange(a.size)
+
+
+def substract_inverse(a: np.ndarray, b: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    return a + b, np.arange(a.size)
+
+
+def multiply_inverse(a: np.ndarray, b: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    if b == 0:
+        return None if (a == 0).any() else (a[:0], np.arange(0))
+    index: np.ndarray = np.flatnonzero(a % b == 0)
+    return a[index] // b, index
+
+
+def divide_inverse(a: np.ndarray, b: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    # Floor division by b maps b values to a: [b*a, b*a+b-1] for b > 0, [b*a+b+1, b*a] for b < 0
+    if b == 0:
+        return a[:0], np.arange(0)
+    index: np.ndarray = np.repeat(np.arange(a.size), abs(b))
+    offsets: np.ndarray = np.tile(np.arange(b) if b > 0 else np.arange(b + 1, 1), a.size)
+    return a[index] * b + offsets, index
+
+
+def append_inverse(a: np.ndarray, b: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    shift: int = 10**len(b)
+    rest: np.ndarray = np.abs(a) // shift
+    index: np.ndarray = np.flatnonzero((np.abs(a) % shift == int(b)) & (rest > 0))
+    # Appending to 0 gives the appended number itself
+    zeros: np.ndarray = np.flatnonzero(a == int(b))
+    return (np.concatenate([with_sign_batch(a[index], rest[index]), np.zeros(zeros.size, dtype=a.dtype)]),
+            np.concatenate([index, zeros]))
+
+
+def backspace_inverse(a: np.ndarray, b: None) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    index: np.ndarray = np.repeat(np.arange(a.size), 10)
+    values: np.ndarray = with_sign_batch(a[index], np.abs(a[index]) * 10 + np.tile(np.arange(10), a.size))
+    # The negative values of one digit lead to 0 as well
+    zeros: np.ndarray = np.repeat(np.flatnonzero(a == 0), 9)
+    return (np.concatenate([values, np.tile(np.arange(-9, 0), zeros.size // 9).astype(a.dtype)]),
+            np.concatenate([index, zeros]))
+
+
+def flip_sign_inverse(a: np.ndarray, b: None) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    return -a, np.arange(a.size)
+
+
+class Operation(NamedTuple):
+    pattern: str  # How the button is written, its groups are the argument
+    parse: Callable[[re.Match], Argument]
+    label: Callable[[Argument], str]
+    batch: Callable[[np.ndarray, Argument], Optional[np.ndarray]]
+    bound: Callable[[int, Argument], int]
+    inverse: Optional[Callable[[np.ndarray, Argument], Optional[Tuple[np.ndarray, np.ndarray]]]]
+    inverse_bound: Optional[Callable[[int, Argument], int]]
+
+
+# The operations by their scalar form, which is what a function of the solver holds
+operation_map: Dict[Callable, Operation] = {
+    add: Operation(r'\+(-?\d+)', lambda m: int(m[1]), lambda b: f'+{b}',
+                   add, arithmetic_bound, add_inverse, arithmetic_bound),
+    substract: Operation(r'-(-?\d+)', lambda m: int(m[1]), lambda b: f'-{b}',
+                         substract, arithmetic_bound, substract_inverse, arithmetic_bound),
+    multiply: Operation(r'\*(-?\d+)', lambda m: int(m[1]), lambda b: f'*{b}',
+                        multiply, arithmetic_bound, multiply_inverse, same_bound),
+    divide: Operation(r'/(-?\d+)', lambda m: int(m[1]), lambda b: f'/{b}',
+                      divide_batch, arithmetic_bound, divide_inverse, arithmetic_bound),
+    append: Operation(r'(\d+)', lambda m: m[1], lambda b: b,
+                      append_batch, append_bound, append_inverse, same_bound),
+    backspace: Operation(r'<<', lambda m: None, lambda b: '<<',
+                         backspace_batch, same_bound, backspace_inverse, backspace_inverse_bound),
+    flip_sign: Operation(r'\+/-', lambda m: None, lambda b: '+/-',
+                         flip_sign, same_bound, flip_sign_inverse, same_bound),
+    reverse: Operation(r'(?i)reverse', lambda m: None, lambda b: 'Reverse',
+                       reverse_batch, reverse_bound, None, None),
+    sum_digits: Operation(r'(?i)sum', lambda m: None, lambda b: 'SUM',
+                          sum_digits_batch, same_bound, None, None),
+    mirror: Operation(r'(?i)mirror', lambda m: None, lambda b: 'Mirror',
+                      mirror_batch, mirror_bound, None, None),
+    replace: Operation(r'(\d+)=>(\d+)', lambda m: (m[1], m[2]), lambda b: f'{b[0]}=>{b[1]}',
+                       replace_batch, replace_bound, None, None),
+}
+
+
+def parse_function(token: str) -> Optional[Function]:
+    for func, operation in operation_map.items():
+        match: Optional[re.Match] = re.fullmatch(operation.pattern, token)
+        if match is not None:
+            return func, operation.parse(match)
+    return None
+
+
+def solve(moves: int, goal: int, start: int, functions: List[Function]) -> Optional[List[Function]]:
+    if start == goal:
+        return list()
+
+    # Searching level by level, the first time the goal is reached takes the fewest moves.
+    # A value reached again has at most as many moves left as the first time,
+    # so the state (value, moves left) is covered already and is not expanded again.
+    # Only the current level keeps its sorted values. For every state of every level only the
+    # index of its parent in the level before (int32) and of the operation leading to it (uint16)
+    # are kept, next to its value in the visited values. Once a value could leave the int64 range
+    # the values become Python ints in object arrays, on which the batch forms work as well.
+    dtype: type = np.int64 if max(abs(start), abs(goal)) <= INT64_LIMIT else object
+    level: np.ndarray = np.array([start], dtype=dtype)
+    visited: np.ndarray = level.copy()
+    parents: List[np.ndarray] = list()
+    operations: List[np.ndarray] = list()
+
+    for _ in range(moves):
+        if needs_objects(level, functions, False):
+            level, visited = level.astype(object), visited.astype(object)
+        values, level_parents, level_operations = expand_forward(level, functions)
+        positions, found = find(visited, values)
+        values, positions = values[~found], positions[~found]
+        if values.size == 0:
+            break
+        parents.append(level_parents[~found])
+        operations.append(level_operations[~found])
+
+        index: int = int(np.searchsorted(values, goal))
+        if index < values.size and values[index] == goal:
+            return get_level_path(functions, parents, operations, index)
+
+        visited = np.insert(visited, positions, values)
+        level = values
+
+    return None
+
+
+def needs_objects(level: np.ndarray, functions: List[Function], backward: bool) -> bool:
+    if level.dtype == object:
+        return False
+    largest: int = int(np.abs(level).max())
+    return any((operation_map[func].inverse_bound if backward else operation_map[func].bound)(largest, argument)
+               > INT64_LIMIT for func, argument in functions)
+
+
+# Membership through the sorted values, which is as fast on object arrays: where every value would be
+# inserted and whether it is there already
+def find(sorted_values: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    if sorted_values.dtype != values.dtype:
+        sorted_values, values = sorted_values.astype(object), values.astype(object)
+    positions: np.ndarray = np.searchsorted(sorted_values, values)
+    return positions, sorted_values[np.minimum(positions, sorted_values.size - 1)] == values
+
+
+# The values of the next level, each once and sorted, with the index of the value of the level leading
+# to it (int32) and of its operation (uint16)
+def get_children(level: np.ndarray, children: List[np.ndarray], parents: List[np.ndarray],
+                 operations: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if not children:
+        return level[:0], np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.uint16)
+    values, first = np.unique(np.concatenate(children), return_index=True)
+    return values, np.concatenate(parents)[first].astype(np.int32), np.concatenate(operations)[first]
+
+
+def expand_forward(level: np.ndarray, functions: List[Function]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    children: List[np.ndarray] = list()
+    parents: List[np.ndarray] = list()
+    operations: List[np.ndarray] = list()
+    for i, (func, argument) in enumerate(functions):
+        new_values: Optional[np.ndarray] = operation_map[func].batch(level, argument)
+        if new_values is None:
+            continue
+        children.append(new_values)
+        parents.append(np.arange(level.size, dtype=np.int32))
+        operations.append(np.full(level.size, i, dtype=np.uint16))
+    return get_children(level, children, parents, operations)
+
+
+def expand_backward(level: np.ndarray,
+                    functions: List[Function]) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    children: List[np.ndarray] = list()
+    parents: List[np.ndarray] = list()
+    operations: List[np.ndarray] = list()
+    for i, (func, argument) in enumerate(functions):
+        previous: Optional[Tuple[np.ndarray, np.ndarray]] = operation_map[func].inverse(level, argument)
+        if previous is None:
+            return None
+        children.append(previous[0])
+        parents.append(previous[1])
+        operations.append(np.full(previous[1].size, i, dtype=np.uint16))
+    return get_children(level, children, parents, operations)
+
+
+def get_level_path(functions: List[Function], parents: List[np.ndarray],
+                   operations: List[np.ndarray], index: int) -> List[Function]:
+    path: List[Function] = list()
+    for level_parents, level_operations in zip(reversed(parents), reversed(operations)):
+        path.append(functions[level_operations[index]])
+        index = level_parents[index]
+    return path[::-1]
+
+
+class Side:
+    # The values reached from the start, or leading to the goal, level by level as in solve.
+    # Every level keeps its sorted values, to find the path from a value where the sides meet.
+    def __init__(self, value: int, backward: bool) -> None:
+        dtype: type = np.int64 if abs(value) <= INT64_LIMIT else object
+        self.backward: bool = backward
+        self.levels: List[np.ndarray] = [np.array([value], dtype=dtype)]
+        self.parents: List[np.ndarray] = list()
+        self.operations: List[np.ndarray] = list()
+        self.visited: np.ndarray = self.levels[0].copy()
+
+    def expand(self, functions: List[Function]) -> Optional[np.ndarray]:
+        if needs_objects(self.levels[-1], functions, self.backward):
+            self.levels[-1], self.visited = self.levels[-1].astype(object), self.visited.astype(object)
+        expand: Callable = expand_backward if self.backward else expand_forward
+        children: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = expand(self.levels[-1], functions)
+        if children is None:
+            return None
+        values, parents, operations = children
+        positions, found = find(self.visited, values)
+        values = values[~found]
+        self.visited = np.insert(self.visited, positions[~found], values)
+        self.levels.append(values)
+        self.parents.append(parents[~found])
+        self.operations.append(operations[~found])
+        return values
+
+    def get_depths(self, values: np.ndarray) -> np.ndarray:
+        depths: np.ndarray = np.zeros(values.size, dtype=np.int64)
+        for depth, level in enumerate(self.levels):
+            depths[find(level, values)[1]] = depth
+        return depths
+
+    def get_path(self, functions: List[Function], value: int) -> List[Function]:
+        values: np.ndarray = np.array([value])
+        depth: int = int(self.get_depths(values)[0])
+        index: int = int(find(self.levels[depth], values)[0][0])
+        path: List[Function] = get_level_path(functions, self.parents[:depth], self.operations[:depth], index)
+        # Backward the path leads from the value to the goal
+        return path[::-1] if self.backward else path
+
+
+def solve_bidirectional(moves: int, goal: int, start: int, functions: List[Function]) -> Optional[List[Function]]:
+    if start == goal:
+        return list()
+    if any(operation_map[func].inverse is None for func, _ in functions):
+        return solve(moves, goal, start, functions)
+
+    forward: Side = Side(start, False)
+    backward: Side = Side(goal, True)
+
+    for _ in range(moves):
+        # Expanding the smaller side, the two sides only have to meet halfway
+        if forward.levels[-1].size <= backward.levels[-1].size:
+            side, other = forward, backward
+        else:
+            side, other = backward, forward
+        level: Optional[np.ndarray] = side.expand(functions)
+        if level is None:
+            # Multiplying by 0 reaches 0 from every value, which cannot be searched backward
+            return solve(moves, goal, start, functions)
+
+        meetings: np.ndarray = level[find(other.visited, level)[1]]
+        if meetings.size:
+            # Every value of a level is as far from its side, so the nearest to the other side is the shortest
+            meeting: int = meetings[np.argmin(other.get_depths(meetings))]
+            return forward.get_path(functions, meeting) + backward.get_path(functions, meeting)
+
+        if level.size == 0:
+            break
+
+    return None
+
+
+def format_function(function: Function) -> str:
+    func, argument = function
+    return operation_map[func].label(argument)
+
+
+def ask_functions() -> List[Function]:
     while True:            
-        functions: List[Tuple[Callable, int]] = list() 
+        functions: List[Function] = list() 
         inp: List[str] = input('Pleae enter the available functions >> ').split()
 
         for f in inp:
-            try:
-                assert f[0] in function_map.keys()
-                number: int = int(f[1:])
-                functions.append((function_map.get(f[0]), number))
-            except ValueError:
-                print('Please enter valid numbers', end='')
-            except AssertionError:
-                print('Please enter valid operators')
+            function: Optional[Function] = parse_function(f)
+            if function is None:
+                print(f'Please enter valid operators, {f} is not one')
+            else:
+                functions.append(function)
 
         if len(functions) == len(inp):
             break
@@ -104,5 +471,10 @@ if __name__ == '__main__':
     moves: int = ask_value('How many moves?', True)
     goal: int = ask_value('What is the goal?', False)
     start: int = ask_value('What is the starting number?', False)
-    functions: List[Tuple[Callable, int]] = ask_functions()
-    
\ No newline at end of file
+    functions: List[Function] = ask_functions()
+
+    solution: Optional[List[Function]] = solve_bidirectional(moves, goal, start, functions)
+    if solution is None:
+        print(f'{goal} cannot be reached from {start} in {moves} moves')
+    else:
+        print(' '.join(format_function(function) for function in solution))